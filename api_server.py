@@ -0,0 +1,298 @@
+import argparse
+import json
+import re
+from datetime import date
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from modules.data_manager import DataManager
+from modules.locking import WriteLock
+from modules import config
+
+# Query parameter -> tracker column
+FILTERS = {
+    'region': 'Region',
+    'status': 'Status',
+    'program_area': 'Program Area',
+}
+EDITABLE_COLUMNS = ['Status', 'Progress (%)', 'Comments'] # Same fields as the app's data editor
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status code."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _json_default(value):
+    """Converts numpy scalars (and anything else) for json.dumps."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def _tracker(params):
+    """Tracker named by the 'tracker' query parameter (default: config.DEFAULT_TRACKER)."""
+    name = params.get('tracker', [config.DEFAULT_TRACKER])[0]
+    if name not in config.TRACKERS:
+        raise ApiError(404, f"Unknown tracker: {name}")
+    return name
+
+def _not_found(tracker):
+    """503 for a configured tracker whose workbook is missing."""
+    return ApiError(503, f"Tracker file not found: {config.TRACKERS[tracker or config.DEFAULT_TRACKER][0]}")
+
+def _etag(tracker=None):
+    """ETag of the tracker's current contents."""
+    version = DataManager.data_version(tracker)
+    return f'"{version[:16]}"' if version else None
+
+def query_tasks(params):
+    """Filters and paginates tasks for GET /tasks. Returns the response body."""
+    tracker = _tracker(params)
+    fiscal_years = params.get('fiscal_year')
+    df = DataManager.load_data(fiscal_years, params.get('region'), copy=False, tracker=tracker)
+    if df is None:
+        raise _not_found(tracker)
+
+    for param, col in FILTERS.items():
+        if params.get(param) and col in df.columns:
+            df = df[df[col].isin(params[param])]
+    if params.get('q'):
+        query = params['q'][0]
+        df = df[df['Activities'].astype(str).str.contains(query, case=False, regex=False) |
+                df['ACMS Sub-Activities'].astype(str).str.contains(query, case=False, regex=False)]
+
+    try:
+        page = max(int(params.get('page', ['1'])[0]), 1)
+        page_size = min(max(int(params.get('page_size', [DEFAULT_PAGE_SIZE])[0]), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(400, "page and page_size must be integers")
+
+    total = len(df)
+    items = df.iloc[(page - 1) * page_size:page * page_size]
+    return {
+        'items': items.to_dict(orient='records'),
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'next_page': page + 1 if page * page_size < total else None,
+    }
+
+def get_task(task_id, tracker=None):
+    """Returns one task for GET /tasks/<id>."""
+    df = DataManager.load_data(copy=False, tracker=tracker)
+    if df is None:
+        raise _not_found(tracker)
+    rows = df[df['ID'] == task_id]
+    if rows.empty:
+        raise ApiError(404, f"Task {task_id} not found")
+    return rows.iloc[0].to_dict()
+
+def get_comments(task_id, tracker=None):
+    """Returns one task's comment thread for GET /tasks/<id>/comments, oldest first."""
+    df = DataManager.load_data(copy=False, tracker=tracker)
+    if df is None:
+        raise _not_found(tracker)
+    if not (df['ID'] == task_id).any():
+        raise ApiError(404, f"Task {task_id} not found")
+    return {'comments': DataManager.comment_thread(task_id, tracker).to_dict(orient='records')}
+
+def get_summary(params):
+    """Status counts per Region x Program Area for GET /summary, from the materialized rollups."""
+    tracker = _tracker(params)
+    tables = DataManager.load_rollups(params.get('fiscal_year'), params.get('region'), tracker)
+    if tables is None:
+        raise _not_found(tracker)
+    return {'status_counts': tables[0].to_dict(orient='records')}
+
+def get_history(params):
+    """Daily completion counts for GET /history?start=YYYY-MM-DD[&end=][&by=region|program_area] (not cached)."""
+    tracker = _tracker(params)
+    if not params.get('start'):
+        raise ApiError(400, "Query parameter 'start' is required")
+    by = params.get('by', [None])[0]
+    if by is not None and by not in ('region', 'program_area'):
+        raise ApiError(400, "'by' must be region or program_area")
+    try:
+        trend = DataManager.progress_history(params['start'][0], params.get('end', [date.today()])[0],
+                                             FILTERS.get(by), tracker)
+    except ValueError as e:
+        raise ApiError(400, f"Invalid date: {e}")
+    trend['Day'] = trend['Day'].astype(str)
+    return {'history': trend.to_dict(orient='records')}
+
+@lru_cache(maxsize=256)
+def render_get(etag, path):
+    """Serialized body for a GET path, cached per data version (ETag)."""
+    url = urlparse(path)
+    params = parse_qs(url.query)
+    match = re.fullmatch(r'/tasks/(\d+)(/comments)?', url.path)
+    if url.path == '/tasks':
+        body = query_tasks(params)
+    elif match and match.group(2):
+        body = get_comments(int(match.group(1)), _tracker(params))
+    elif match:
+        body = get_task(int(match.group(1)), _tracker(params))
+    elif url.path == '/summary':
+        body = get_summary(params)
+    else:
+        raise ApiError(404, f"Unknown endpoint: {url.path}")
+    return json.dumps(body, default=_json_default).encode('utf-8')
+
+def _validate_update(update, known_ids):
+    """Checks one PATCH item and returns (ID, {column: value})."""
+    if not isinstance(update, dict) or 'ID' not in update:
+        raise ApiError(400, "Each update must be an object with an 'ID'")
+    try:
+        task_id = int(update['ID'])
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Invalid ID: {update['ID']!r}")
+    if task_id not in known_ids:
+        raise ApiError(404, f"Task {task_id} not found")
+
+    fields = {k: v for k, v in update.items() if k != 'ID'}
+    unknown = [k for k in fields if k not in EDITABLE_COLUMNS]
+    if unknown or not fields:
+        raise ApiError(400, f"Task {task_id}: only {', '.join(EDITABLE_COLUMNS)} can be updated")
+    if 'Status' in fields and fields['Status'] not in config.STATUS_OPTIONS:
+        raise ApiError(422, f"Task {task_id}: Status must be one of {', '.join(config.STATUS_OPTIONS)}")
+    if 'Progress (%)' in fields:
+        progress = fields['Progress (%)']
+        if isinstance(progress, bool) or not isinstance(progress, (int, float)) or not 0 <= progress <= 100 or progress != int(progress):
+            raise ApiError(422, f"Task {task_id}: Progress (%) must be a whole number from 0 to 100")
+        fields['Progress (%)'] = int(progress) # The tracker stores whole percents
+    if 'Comments' in fields and not isinstance(fields['Comments'], str):
+        raise ApiError(422, f"Task {task_id}: Comments must be a string")
+    if 'Comments' in fields and ILLEGAL_CHARACTERS_RE.search(fields['Comments']):
+        raise ApiError(422, f"Task {task_id}: Comments must not contain control characters")
+    return task_id, fields
+
+def get_trackers():
+    """Available trackers and the shared cache's statistics for GET /trackers (never cached)."""
+    stats = DataManager.cache_stats()
+    return {
+        'trackers': DataManager.trackers(),
+        'default': config.DEFAULT_TRACKER,
+        'cache': {'max_mb': config.CACHE_MAX_MB, 'stats': stats.rename_axis('Tracker').reset_index().to_dict(orient='records')},
+    }
+
+def patch_tasks(body, user, if_match=None, tracker=None):
+    """Applies a batch of updates in one save (all or nothing). Returns the response body."""
+    if not user or "@" not in user:
+        raise ApiError(400, "A valid user email is required ('user' field or X-User header)")
+    updates = body.get('updates') if isinstance(body, dict) else body
+    if not isinstance(updates, list) or not updates:
+        raise ApiError(400, "Expected a non-empty list of updates")
+
+    # Validate and save under the write lock, so the batch applies to the latest data
+    with WriteLock.hold():
+        if if_match and if_match != _etag(tracker):
+            raise ApiError(412, "Tracker changed since it was read (ETag mismatch)")
+        df = DataManager.load_data(tracker=tracker)
+        if df is None:
+            raise _not_found(tracker)
+
+        known_ids = set(df['ID'].tolist())
+        edits = {}
+        for update in updates:
+            task_id, fields = _validate_update(update, known_ids)
+            edits.setdefault(task_id, {}).update(fields)
+
+        edited_df = df[df['ID'].isin(list(edits))][['ID'] + EDITABLE_COLUMNS].copy()
+        for task_id, fields in edits.items():
+            for col, value in fields.items():
+                edited_df.loc[edited_df['ID'] == task_id, col] = value
+
+        changed_ids, comments = DataManager.apply_changes(df, edited_df, user, tracker)
+        if changed_ids and not DataManager.save_data(df, changed_ids=changed_ids, comments=comments, tracker=tracker):
+            raise ApiError(500, "Saving the tracker failed")
+    return {'changed': [int(i) for i in changed_ids]}
+
+class TrackerApiHandler(BaseHTTPRequestHandler):
+    """JSON API over DataManager: GET /tasks, GET /tasks/<id>[/comments], GET /summary, GET /history, GET /trackers, PATCH /tasks.
+
+    Every endpoint takes an optional ?tracker=<name> (see config.TRACKERS).
+    """
+
+    server_version = "CHASACTrackerAPI/1.0"
+
+    def _send(self, status, body=None, etag=None):
+        if body is None or isinstance(body, bytes):
+            payload = body or b''
+        else:
+            payload = json.dumps(body, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self, action):
+        try:
+            action()
+        except ApiError as e:
+            self._send(e.status, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': f"Internal error: {e}"})
+
+    def do_GET(self):
+        def action():
+            url = urlparse(self.path)
+            if url.path == '/trackers':
+                self._send(200, get_trackers())
+                return
+            if url.path == '/history':
+                self._send(200, get_history(parse_qs(url.query)))
+                return
+            etag = _etag(_tracker(parse_qs(url.query)))
+            if etag and self.headers.get('If-None-Match') == etag:
+                self._send(304, etag=etag)
+                return
+            self._send(200, render_get(etag, self.path), etag=etag)
+        self._handle(action)
+
+    def do_PATCH(self):
+        def action():
+            url = urlparse(self.path)
+            if url.path != '/tasks':
+                raise ApiError(404, f"Unknown endpoint: {self.path}")
+            tracker = _tracker(parse_qs(url.query))
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'null')
+            except ValueError:
+                raise ApiError(400, "Request body must be JSON")
+            user = (body.get('user') if isinstance(body, dict) else None) or self.headers.get('X-User')
+            result = patch_tasks(body, user, self.headers.get('If-Match'), tracker)
+            self._send(200, result, etag=_etag(tracker))
+        self._handle(action)
+
+    def log_message(self, format, *args):
+        pass # Keep the console quiet under load
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSON API for the CHASAC workplan tracker")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    # Load once up front so any pending migration happens before the first ETag is handed out
+    trackers = [name for name in DataManager.trackers() if DataManager.load_data(copy=False, tracker=name) is not None]
+    if not trackers:
+        print(f"Error: Tracker file not found at {config.TRACKER_FILE}")
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), TrackerApiHandler)
+    print(f"Serving {', '.join(trackers)} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Goodbye!")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import streamlit as st
 from modules.data_manager import DataManager
-from modules.ui import setup_page, render_metrics, render_filters, render_data_editor, render_financial_summary, render_login
+from modules.ui import setup_page, render_metrics, render_filters, render_data_editor, render_financial_summary, render_login, render_fiscal_year_filter, render_fiscal_year_overview, render_report_export, render_comment_thread, render_tracker_selector, render_cache_stats, render_hierarchy, render_burndown
 from modules import config
-from datetime import datetime
+from modules import rollups
 
 def main():
     # 1. Setup Page
@@ -15,56 +15,53 @@ def main():
     st.title("📊 CHASAC Workplan Tracker")
     st.markdown("---")
 
-    # 3. Load Data
-    df = DataManager.load_data()
-    if df is None:
+    # 3. Load Data (only the selected tracker and fiscal years)
+    tracker = render_tracker_selector(DataManager.trackers())
+    if tracker is None:
         st.error(f"Tracker file not found: {config.TRACKER_FILE}. Please run extraction script first.")
         return
+    fiscal_years = DataManager.fiscal_years(tracker)
+    selected_years = render_fiscal_year_filter(fiscal_years)
+    df = DataManager.load_data(selected_years, tracker=tracker)
+    if df is None:
+        st.error(f"Could not load tracker: {tracker}.")
+        return
+
+    budget_df = DataManager.load_budgets(selected_years, tracker=tracker)
+    budget_view = DataManager.load_budget_view(selected_years, tracker=tracker)
+    status_rollup, budget_rollup = DataManager.load_rollups(selected_years, tracker=tracker)
 
     # 4. Sidebar Filters
-    filtered_df, selected_region = render_filters(df)
+    filtered_df, selected_region, selection = render_filters(df)
+    render_report_export(df, budget_view, DataManager.data_version(tracker), selected_years, tracker)
+    render_cache_stats(DataManager.cache_stats())
 
     # 5. Metrics
-    render_metrics(df, filtered_df)
+    render_metrics(df, filtered_df, status_rollup)
+    if len(fiscal_years) > 1:
+        render_fiscal_year_overview(DataManager.fiscal_year_summary(tracker))
     
     # 6. Financial Summary
-    render_financial_summary(filtered_df)
+    render_financial_summary(filtered_df, budget_df, rollups.select(budget_rollup, selection))
+    render_hierarchy(df, DataManager.load_hierarchy(selected_years, tracker=tracker))
+    render_burndown(DataManager.history_start(tracker),
+                    lambda start, end, by: DataManager.progress_history(start, end, by, tracker))
     
     st.markdown("---")
 
     # 7. Data Editor
-    edited_df = render_data_editor(filtered_df)
+    edited_df = render_data_editor(filtered_df, budget_view, DataManager.comment_counts(tracker), key=f"data_editor_{tracker}")
+    posted = render_comment_thread(filtered_df, lambda task_id: DataManager.comment_thread(task_id, tracker))
+    if posted:
+        DataManager.add_comment(df, *posted, st.session_state.user_email, fiscal_years=selected_years, tracker=tracker)
 
     # 8. Save Logic
     if st.button("Save Changes", type="primary"):
         # Map changes back to original dataframe using ID
-        updated_rows = edited_df.set_index('ID')
-        
-        # Iterate and update
-        changes_made = False
-        for idx, row in updated_rows.iterrows():
-            mask = df['ID'] == idx
-            if mask.any():
-                current_row = df.loc[mask].iloc[0]
-                has_changed = (
-                    current_row['Status'] != row['Status'] or
-                    current_row['Progress (%)'] != row['Progress (%)'] or
-                    current_row['Comments'] != row['Comments']
-                )
-                
-                if has_changed:
-                    df.loc[mask, 'Status'] = row['Status']
-                    df.loc[mask, 'Progress (%)'] = row['Progress (%)']
-                    df.loc[mask, 'Comments'] = row['Comments']
-                    
-                    # Update Tracking Info
-                    df.loc[mask, 'Last Modified By'] = st.session_state.user_email
-                    df.loc[mask, 'Last Modified Date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    
-                    changes_made = True
+        changed_ids, comments = DataManager.apply_changes(df, edited_df, st.session_state.user_email, tracker)
         
-        if changes_made:
-            DataManager.save_data(df)
+        if changed_ids:
+            DataManager.save_data(df, fiscal_years=selected_years, changed_ids=changed_ids, comments=comments, tracker=tracker)
         else:
             st.info("No changes detected.")
 
@@ -1,11 +1,16 @@
 import pandas as pd
 import os
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Font
+from modules import config, schema, budgets
+from modules.data_manager import DataManager
 
 # Configuration
 INPUT_FILE = r"WorkPlan/ACMS-HIV CHASAC WorkPlan-FY26-COP25 Updated 18.11.25.xlsx"
-OUTPUT_FILE = "Full_Workplan_Tracker.xlsx"
+TRACKER = "Full Workplan" # The config.TRACKERS entry this extraction feeds
+OUTPUT_FILE, OUTPUT_SHEET = config.TRACKERS[TRACKER]
+# The first run creates OUTPUT_FILE. Later runs with another year's workplan as
+# INPUT_FILE add that year's tasks (new IDs, their own Fiscal Year) and keep every
+# existing status; years the tracker already holds are skipped. Delete
+# OUTPUT_FILE to extract from scratch.
 SHEET_NAME = '4. ACMS WorkPlan detail v1'
 
 def extract_all_tasks():
@@ -18,7 +23,7 @@ def extract_all_tasks():
     try:
         from tqdm import tqdm
         
-        with tqdm(total=8, desc="Overall Progress", unit="step") as pbar:
+        with tqdm(total=6, desc="Overall Progress", unit="step") as pbar:
             # Read with header=1
             df = pd.read_excel(INPUT_FILE, sheet_name=SHEET_NAME, header=1)
             pbar.update(1)
@@ -51,11 +56,11 @@ def extract_all_tasks():
                 'Program Area', 
                 'Level of Activity Implementation (Above-Site, Site-Level)', 
                 'Sub-Activity Category', 
-                'Oct -Dec 2025', 
-                'Jan - Mar 2026', 
                 'Outputs', 
                 'Output Indicators'
             ]
+            # Budget quarters are whatever period columns the workplan has (Oct -Dec 2025, Jan - Mar 2026, ...)
+            cols_to_keep[-2:-2] = budgets.period_columns(df)
             
             existing_cols = [c for c in cols_to_keep if c in df.columns]
             tasks = df[existing_cols].copy()
@@ -68,6 +73,8 @@ def extract_all_tasks():
             
             # 5. Add Tracking Columns
             tasks.insert(0, 'ID', range(1, len(tasks) + 1))
+            # Fiscal year of each task's budget quarters, used to partition the tracker store
+            tasks.insert(1, 'Fiscal Year', budgets.row_fiscal_years(tasks))
             tasks['Status'] = 'Pending'
             tasks['Progress (%)'] = 0
             tasks['Comments'] = ''
@@ -77,42 +84,17 @@ def extract_all_tasks():
             print(f"\nExtracted {len(tasks)} tasks.")
             pbar.set_description("Saving Excel")
             
-            # Save to new Excel
-            tasks.to_excel(OUTPUT_FILE, index=False, sheet_name='All_Tasks')
-            pbar.update(1)
-            pbar.set_description("Formatting Excel")
-            
-            # Formatting
-            wb = load_workbook(OUTPUT_FILE)
-            ws = wb['All_Tasks']
-            
-            # Header formatting
-            header_fill = PatternFill(start_color="2F75B5", end_color="2F75B5", fill_type="solid") # Different color for full tracker
-            header_font = Font(color="FFFFFF", bold=True)
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                
-            # Auto-adjust column widths
-            # Use a nested progress bar for columns as this can be slow
-            for col in tqdm(list(ws.columns), desc="Adjusting Widths", leave=False):
-                max_length = 0
-                column = col[0].column_letter
-                for cell in col:
-                    try:
-                        val_len = len(str(cell.value))
-                        if val_len > max_length:
-                            max_length = val_len
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 60) 
-                ws.column_dimensions[column].width = adjusted_width
-            
-            pbar.update(1)
-            pbar.set_description("Finalizing")
-                
-            wb.save(OUTPUT_FILE)
+            if os.path.exists(OUTPUT_FILE):
+                # Add only the fiscal years the tracker doesn't hold yet
+                added = DataManager.add_fiscal_years(tasks, TRACKER)
+                if added is None:
+                    print(f"Error: Could not add the tasks to {OUTPUT_FILE}. Please close Excel if it is open.")
+                    return
+                print(f"Added {', '.join(added)} to {OUTPUT_FILE}." if added else f"{OUTPUT_FILE} already holds every fiscal year in this workplan; nothing added.")
+            else:
+                # Save to new Excel, normalized on write (long Budgets sheet + schema marker,
+                # header fill and column widths) so the app can load the tracker without cleaning
+                schema.write_workbook(OUTPUT_FILE, OUTPUT_SHEET, tasks)
             pbar.update(1)
             pbar.set_description("Complete")
             
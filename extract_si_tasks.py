@@ -1,11 +1,16 @@
 import pandas as pd
 import os
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Font
+from modules import config, schema, budgets
+from modules.data_manager import DataManager
 
 # Configuration
 INPUT_FILE = r"WorkPlan/ACMS-HIV CHASAC WorkPlan-FY26-COP25 Updated 18.11.25.xlsx"
-OUTPUT_FILE = "SI_Manager_Tracker.xlsx"
+TRACKER = "SI Manager" # The config.TRACKERS entry this extraction feeds
+OUTPUT_FILE, OUTPUT_SHEET = config.TRACKERS[TRACKER]
+# The first run creates OUTPUT_FILE. Later runs with another year's workplan as
+# INPUT_FILE add that year's tasks (new IDs, their own Fiscal Year) and keep every
+# existing status; years the tracker already holds are skipped. Delete
+# OUTPUT_FILE to extract from scratch.
 SHEET_NAME = '4. ACMS WorkPlan detail v1'
 
 def extract_tasks():
@@ -17,7 +22,7 @@ def extract_tasks():
     try:
         from tqdm import tqdm
         
-        with tqdm(total=6, desc="SI Extraction Progress", unit="step") as pbar:
+        with tqdm(total=5, desc="SI Extraction Progress", unit="step") as pbar:
             # Read with header=1 as determined in analysis
             df = pd.read_excel(INPUT_FILE, sheet_name=SHEET_NAME, header=1)
             pbar.update(1)
@@ -52,11 +57,11 @@ def extract_tasks():
                 'Program Area', 
                 'Level of Activity Implementation (Above-Site, Site-Level)', 
                 'Sub-Activity Category', 
-                'Oct -Dec 2025', 
-                'Jan - Mar 2026', 
                 'Outputs', 
                 'Output Indicators'
             ]
+            # Budget quarters are whatever period columns the workplan has (Oct -Dec 2025, Jan - Mar 2026, ...)
+            cols_to_keep[-2:-2] = budgets.period_columns(df)
             
             # Filter columns that actually exist
             existing_cols = [c for c in cols_to_keep if c in si_tasks.columns]
@@ -66,6 +71,8 @@ def extract_tasks():
             
             # Add Tracking Columns
             si_tasks.insert(0, 'ID', range(1, len(si_tasks) + 1))
+            # Fiscal year of each task's budget quarters, used to partition the tracker store
+            si_tasks.insert(1, 'Fiscal Year', budgets.row_fiscal_years(si_tasks))
             si_tasks['Status'] = 'Pending' # Pending, In Progress, Completed, Delayed
             si_tasks['Progress (%)'] = 0
             si_tasks['Comments'] = ''
@@ -73,37 +80,17 @@ def extract_tasks():
             pbar.update(1)
             pbar.set_description("Saving Excel")
             
-            # Save to new Excel
-            si_tasks.to_excel(OUTPUT_FILE, index=False, sheet_name='SI_Tasks')
-            pbar.update(1)
-            pbar.set_description("Formatting Excel")
-            
-            # Formatting
-            wb = load_workbook(OUTPUT_FILE)
-            ws = wb['SI_Tasks']
-            
-            # Header formatting
-            header_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                
-            # Auto-adjust column widths (approximate)
-            for col in tqdm(list(ws.columns), desc="Adjusting Widths", leave=False):
-                max_length = 0
-                column = col[0].column_letter # Get the column name
-                for cell in col:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50) # Cap width at 50
-                ws.column_dimensions[column].width = adjusted_width
-                
-            wb.save(OUTPUT_FILE)
+            if os.path.exists(OUTPUT_FILE):
+                # Add only the fiscal years the tracker doesn't hold yet
+                added = DataManager.add_fiscal_years(si_tasks, TRACKER)
+                if added is None:
+                    print(f"Error: Could not add the tasks to {OUTPUT_FILE}. Please close Excel if it is open.")
+                    return
+                print(f"Added {', '.join(added)} to {OUTPUT_FILE}." if added else f"{OUTPUT_FILE} already holds every fiscal year in this workplan; nothing added.")
+            else:
+                # Save to new Excel, normalized on write (long Budgets sheet + schema marker,
+                # header fill and column widths) so the app can load the tracker without cleaning
+                schema.write_workbook(OUTPUT_FILE, OUTPUT_SHEET, si_tasks)
             pbar.update(1)
             pbar.set_description("Complete")
             
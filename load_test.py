@@ -0,0 +1,243 @@
+import argparse
+import gc
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(REPO_DIR, "app.py")
+
+# Synthetic tracker shape (same columns as Full_Workplan_Tracker.xlsx)
+REGIONS = ["North", "Adamawa", "Extreme North"]
+PROGRAM_AREAS = ["HTS", "Care and Treatment", "PMTCT", "Laboratory", "TB/HIV", "Prevention", "SI"]
+TOPICS = ["HIV testing", "viral load", "linkage to care", "TB screening", "data quality", "supportive supervision", "training"]
+PERIODS = ["Oct -Dec 2025", "Jan - Mar 2026"]
+STATUS_WEIGHTS = {"Pending": 5, "In Progress": 3, "Completed": 2, "Delayed": 1}
+
+# What a session does after logging in, and how often
+ACTION_WEIGHTS = {"filter": 4, "search": 3, "comment": 1, "save": 1}
+SEARCH_TERMS = ["testing", "viral", "supervision", "data", "training", "no such activity"]
+SAMPLE_COLUMNS = ['Interaction', 'Seconds', 'Service', 'OK']
+
+# AppTest swaps a process-global mock runtime in and out on every run, so reruns
+# can't overlap. A Streamlit server runs every session's reruns in one GIL-bound
+# process anyway, so queueing here approximates what users of one server see.
+_run_lock = threading.Lock()
+
+def build_tracker(path, sheet, tasks, seed):
+    """Writes a synthetic tracker with `tasks` rows (Objective -> activity -> sub-activity, three regions)."""
+    from modules import schema, budgets
+    rng = random.Random(seed)
+    rows = []
+    for i in range(tasks):
+        objective, activity, sub = i // 150 + 1, i // 30 % 5 + 1, i // 6 % 5 + 1
+        topic = TOPICS[(i // 30) % len(TOPICS)]
+        code = f"{objective}.{activity}.{sub}"
+        status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+        rows.append({
+            'ID': i + 1,
+            'Region': REGIONS[i % len(REGIONS)],
+            'Fiscal Year': budgets.fiscal_year(PERIODS[0]),
+            'Activities': f"Activities {objective}.{activity} Strengthen {topic}",
+            'Code Sub -activities': code,
+            'ACMS Sub-Activities': f"Sub-Activities {code}.{i % 3 + 1} {topic.capitalize()} in {REGIONS[i % len(REGIONS)]} region",
+            'Program Area': PROGRAM_AREAS[objective % len(PROGRAM_AREAS)],
+            **{period: round(rng.uniform(0, 5000), 2) for period in PERIODS},
+            'Status': status,
+            'Progress (%)': {'Pending': 0, 'Completed': 100}.get(status, rng.randrange(10, 90, 10)),
+            'Comments': '',
+            'Assigned To': '',
+            'Last Modified By': '',
+            'Last Modified Date': '',
+        })
+    schema.write_workbook(path, sheet, pd.DataFrame(rows))
+
+def rss_mb():
+    """Resident memory of this process in MB (Linux)."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+class Session:
+    """One simulated user: an AppTest instance driven through random interactions.
+
+    Each rerun is one sample: (interaction, seconds including the wait for
+    the rerun lock, seconds spent running, ok).
+    """
+
+    def __init__(self, number, seed, timeout):
+        self.email = f"user{number}@loadtest.local"
+        self.rng = random.Random(seed * 1000 + number)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.samples = []
+
+    def _widget(self, widgets, label):
+        widget = next((w for w in widgets if w.label == label), None)
+        if widget is None:
+            raise LookupError(f"'{label}' is not on the page")
+        return widget
+
+    def _rerun(self, interaction):
+        start = time.perf_counter()
+        with _run_lock:
+            began = time.perf_counter()
+            try:
+                self.at.run()
+                ok = not self.at.exception and not self.at.error # The app reports load/save failures with st.error
+            except RuntimeError: # Rerun exceeded the timeout
+                ok = False
+            finished = time.perf_counter()
+        self.samples.append((interaction, finished - start, finished - began, ok))
+        return ok
+
+    def login(self):
+        if not self._rerun('open'):
+            return False
+        self._widget(self.at.text_input, "Email Address").input(self.email)
+        self._widget(self.at.button, "Login").click()
+        return self._rerun('login')
+
+    def filter(self):
+        box = self._widget(self.at.selectbox, self.rng.choice(["Region", "Status", "Program Area"]))
+        box.set_value(self.rng.choice(box.options))
+        self._rerun('filter')
+
+    def search(self):
+        term = self.rng.choice(SEARCH_TERMS + [""]) # "" clears the search
+        self._widget(self.at.text_input, "Search Activities").input(term)
+        self._rerun('search')
+
+    def comment(self):
+        # Posting a comment saves the task through the same path as the editor's Save Changes
+        box = self._widget(self.at.selectbox, "Task")
+        task_ids = [i for i in box.options if i != "Select a task..."]
+        if not task_ids:
+            return # Current filters match nothing
+        box.set_value(int(self.rng.choice(task_ids).split(" - ")[0]))
+        if not self._rerun('open_task'):
+            return
+        self._widget(self.at.text_area, "Add a comment").input(f"Load test comment from {self.email} at {time.time():.0f}")
+        self._widget(self.at.button, "Post Comment").click()
+        self._rerun('comment')
+
+    def save(self):
+        # AppTest can't edit data_editor cells, but an unedited Save Changes still compares every visible row
+        self._widget(self.at.button, "Save Changes").click()
+        self._rerun('save')
+
+def run_session(session, actions, think, start_delay):
+    time.sleep(start_delay)
+    if not session.login():
+        return session.samples
+    for _ in range(actions):
+        action = session.rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+        try:
+            getattr(session, action)()
+        except LookupError: # The last rerun left the page without its widgets (already counted as an error)
+            session.samples.append((action, 0.0, 0.0, False))
+        if think:
+            time.sleep(session.rng.uniform(0, 2 * think))
+    return session.samples
+
+def summarize(samples):
+    """Latency percentiles (ms) and error counts per interaction, plus an 'All' row."""
+    df = pd.DataFrame(samples, columns=SAMPLE_COLUMNS)
+    df = pd.concat([df, df.assign(Interaction='All')], ignore_index=True)
+    grouped = df.groupby('Interaction', sort=False)
+    ms = grouped['Seconds']
+    return pd.DataFrame({
+        'Count': grouped.size(),
+        'Errors': grouped['OK'].apply(lambda ok: int((~ok).sum())),
+        'p50 (ms)': ms.quantile(0.50) * 1000,
+        'p95 (ms)': ms.quantile(0.95) * 1000,
+        'p99 (ms)': ms.quantile(0.99) * 1000,
+        'Max (ms)': ms.max() * 1000,
+    }).round(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-session load test of the Streamlit app against a synthetic tracker (offline)")
+    parser.add_argument('--sessions', type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument('--actions', type=int, default=20, help="Interactions per session after logging in")
+    parser.add_argument('--tasks', type=int, default=3000, help="Rows in the synthetic tracker")
+    parser.add_argument('--think', type=float, default=0.0, help="Mean pause between a session's interactions (seconds)")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Spread session starts over this many seconds")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds before a single rerun counts as failed")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workdir', help="Where to build the synthetic tracker (default: a temporary directory, removed afterwards)")
+    parser.add_argument('--csv', help=f"Also write every sample ({', '.join(SAMPLE_COLUMNS)}) to this file")
+    args = parser.parse_args()
+
+    csv_path = os.path.abspath(args.csv) if args.csv else None
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="chasac_loadtest_")
+    os.makedirs(workdir, exist_ok=True)
+    # The tracker, caches, backups and databases all live at paths relative to the working directory,
+    # so the app's modules are imported only after moving into the scratch one
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    logging.disable(logging.WARNING) # Bare-mode and deprecation warnings from every rerun would drown the report
+    from modules import config
+
+    try:
+        print(f"Building a synthetic tracker with {args.tasks} tasks in {workdir}")
+        build_tracker(config.TRACKER_FILE, config.SHEET_NAME, args.tasks, args.seed)
+
+        # One uncounted session takes the cold start (store build, caches), so growth below is steady-state
+        warmup = Session(args.sessions, args.seed, args.timeout)
+        if not warmup.login():
+            print(f"Error: The app failed to start: {[e.value for e in warmup.at.exception]}")
+            return
+        cold_start = sum(sample[1] for sample in warmup.samples)
+        gc.collect()
+        rss_start = rss_mb()
+        peak = [rss_start]
+        done = threading.Event()
+        def monitor():
+            while not done.wait(0.25):
+                peak[0] = max(peak[0], rss_mb())
+        threading.Thread(target=monitor, daemon=True).start()
+
+        print(f"Running {args.sessions} sessions x {args.actions} interactions...")
+        sessions = [Session(n, args.seed, args.timeout) for n in range(args.sessions)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            delays = [args.ramp_up * n / max(args.sessions, 1) for n in range(args.sessions)]
+            results = list(pool.map(run_session, sessions, [args.actions] * args.sessions, [args.think] * args.sessions, delays))
+        elapsed = time.perf_counter() - started
+        done.set()
+        gc.collect()
+        rss_end = rss_mb()
+        peak[0] = max(peak[0], rss_end)
+
+        samples = [s for result in results for s in result]
+        if not samples:
+            print("Error: No interactions were recorded.")
+            return
+        if csv_path:
+            pd.DataFrame(samples, columns=SAMPLE_COLUMNS).to_csv(csv_path, index=False)
+
+        print("\n" + "=" * 80)
+        print("       LOAD TEST RESULTS       ")
+        print("=" * 80)
+        print(summarize(samples).to_string())
+        print("-" * 80)
+        print(f"Sessions: {args.sessions}   Tasks: {args.tasks}   Wall time: {elapsed:.1f} s   Cold start: {cold_start * 1000:.0f} ms")
+        busy = sum(sample[2] for sample in samples) / elapsed
+        print(f"Throughput: {len(samples) / elapsed:.2f} interactions/s   Server busy: {busy:.0%} of wall time")
+        growth = rss_end - rss_start
+        print(f"Memory (RSS): {rss_start:.0f} MB after warm-up, {rss_end:.0f} MB at end, {peak[0]:.0f} MB peak "
+              f"({growth:+.0f} MB, {growth / len(samples) * 1000:+.1f} MB per 1000 interactions)")
+        print("=" * 80)
+    finally:
+        os.chdir(REPO_DIR)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import re
+import pandas as pd
+
+BUDGET_SHEET = "Budgets"
+BUDGET_COLUMNS = ['ID', 'Region', 'Period', 'Amount']
+
+# Quarter headers as they appear in the source workplan, e.g. "Oct -Dec 2025", "Jan - Mar 2026"
+PERIOD_PATTERN = re.compile(r'^\s*([A-Za-z]{3})[A-Za-z]*\s*-\s*([A-Za-z]{3})[A-Za-z]*\s+(\d{4})\s*$')
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+def is_period(name):
+    """True if `name` is a budget period header such as 'Oct -Dec 2025'."""
+    match = PERIOD_PATTERN.match(str(name))
+    return bool(match) and match.group(1).lower() in MONTHS and match.group(2).lower() in MONTHS
+
+def period_sort_key(period):
+    """Chronological sort key (year, end month) for a period header."""
+    match = PERIOD_PATTERN.match(str(period))
+    return int(match.group(3)), MONTHS.index(match.group(2).lower())
+
+def period_columns(df):
+    """Returns the budget period columns of a wide frame, in chronological order."""
+    return sorted([c for c in df.columns if is_period(c)], key=period_sort_key)
+
+def fiscal_year(period):
+    """Fiscal year (Oct-Sep) a period falls in, e.g. 'Oct -Dec 2025' -> 'FY26'."""
+    year, end_month = period_sort_key(period)
+    if end_month >= MONTHS.index('oct'):
+        year += 1
+    return f"FY{year % 100:02d}"
+
+def row_fiscal_years(df, default=''):
+    """Per-row fiscal year of a wide frame: the year of each row's first budgeted period.
+
+    Rows with no budget take the year of the frame's first period
+    (`default` if it has none), so a workplan spanning two fiscal years
+    keeps each task in its own year.
+    """
+    periods = period_columns(df)
+    if not periods:
+        return pd.Series(default, index=df.index)
+    amounts = df[periods].apply(pd.to_numeric, errors='coerce').fillna(0)
+    years = pd.Series([fiscal_year(p) for p in periods], index=periods)
+    budgeted = amounts.ne(0)
+    first = budgeted.idxmax(axis=1).map(years)
+    return first.where(budgeted.any(axis=1), years.iloc[0])
+
+def period_label(period):
+    """Short display label, e.g. 'Oct -Dec 2025' -> 'FY26 Q1'."""
+    _, end_month = period_sort_key(period)
+    quarter = ((end_month - MONTHS.index('oct')) % 12) // 3 + 1
+    return f"{fiscal_year(period)} Q{quarter}"
+
+def normalize(budgets):
+    """Returns the canonical long budget table, sorted by ID and period."""
+    budgets = budgets.copy()
+    budgets['ID'] = pd.to_numeric(budgets['ID'], errors='coerce').fillna(0).astype(int)
+    budgets['Period'] = budgets['Period'].astype(str)
+    budgets['Amount'] = pd.to_numeric(budgets['Amount'], errors='coerce').fillna(0).astype(float)
+    cols = [c for c in BUDGET_COLUMNS if c in budgets.columns]
+    order = budgets['Period'].map(lambda p: period_sort_key(p) if is_period(p) else (0, 0))
+    budgets = budgets.assign(_order=order).sort_values(['ID', '_order'], kind='stable')
+    return budgets[cols].reset_index(drop=True)
+
+def split(df):
+    """Moves the wide period columns of `df` into a long (ID, Region, Period, Amount) table."""
+    periods = period_columns(df)
+    id_vars = [c for c in ['ID', 'Region'] if c in df.columns]
+    long = df[id_vars + periods].melt(id_vars=id_vars, value_vars=periods, var_name='Period', value_name='Amount')
+    return df.drop(columns=periods), normalize(long)
+
+def pivot(budgets):
+    """Wide view of a long budget table: one row per ID, one column per period."""
+    if budgets is None or budgets.empty:
+        return pd.DataFrame(index=pd.Index([], name='ID'))
+    wide = budgets.pivot_table(index='ID', columns='Period', values='Amount', aggfunc='sum', fill_value=0)
+    wide.columns.name = None
+    return wide[sorted(wide.columns, key=period_sort_key)]
+
+def attach(df, budgets):
+    """Joins the wide budget view onto a task table by ID."""
+    return df.join(pivot(budgets), on='ID').fillna({p: 0 for p in budgets['Period'].unique()})
+
+def read_budgets(xls):
+    """Reads the long budget sheet from a pd.ExcelFile, or None if it has none."""
+    if BUDGET_SHEET not in xls.sheet_names:
+        return None
+    return normalize(pd.read_excel(xls, sheet_name=BUDGET_SHEET))
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+from . import config
+
+STAT_COLUMNS = ['Entries', 'Size (MB)', 'Hits', 'Patches', 'Misses', 'Evictions']
+
+def frame_bytes(tables):
+    """In-memory size of a tuple of frames, including string payloads."""
+    return int(sum(t.memory_usage(index=True, deep=True).sum() for t in tables))
+
+class FrameCache:
+    """In-memory tracker frames shared by every session, bounded by config.CACHE_MAX_MB.
+
+    Entries are keyed by (tracker, scope) and evicted least recently used
+    first once the total size exceeds the budget. Per-tracker counters
+    (hits, patches, misses, evictions) show how well the budget fits.
+    """
+
+    _entries = OrderedDict() # (tracker, scope) -> {'version', 'source_hash', 'tables', 'bytes'}
+    _bytes = 0
+    _stats = {} # tracker -> counters
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _count(tracker, counter, n=1):
+        stats = FrameCache._stats.setdefault(tracker, dict.fromkeys(['hits', 'patches', 'misses', 'evictions'], 0))
+        stats[counter] += n
+
+    @staticmethod
+    def get(tracker, scope):
+        """Returns the entry for (tracker, scope) and marks it recently used, or None."""
+        with FrameCache._lock:
+            entry = FrameCache._entries.get((tracker, scope))
+            if entry is not None:
+                FrameCache._entries.move_to_end((tracker, scope))
+            return entry
+
+    @staticmethod
+    def put(tracker, scope, entry, counter='misses'):
+        """Stores an entry (a full load, or a patched one with counter='patches') and evicts to fit the budget."""
+        entry['bytes'] = frame_bytes(entry['tables'])
+        with FrameCache._lock:
+            old = FrameCache._entries.pop((tracker, scope), None)
+            if old is not None:
+                FrameCache._bytes -= old['bytes']
+            FrameCache._entries[(tracker, scope)] = entry
+            FrameCache._bytes += entry['bytes']
+            FrameCache._count(tracker, counter)
+            FrameCache._evict(config.CACHE_MAX_MB * 1024 * 1024)
+
+    @staticmethod
+    def hit(tracker):
+        """Counts a lookup served from the cache as is."""
+        with FrameCache._lock:
+            FrameCache._count(tracker, 'hits')
+
+    @staticmethod
+    def _evict(budget):
+        """Drops least recently used entries until the total fits `budget` (the newest entry always stays)."""
+        while FrameCache._bytes > budget and len(FrameCache._entries) > 1:
+            (tracker, _), entry = FrameCache._entries.popitem(last=False)
+            FrameCache._bytes -= entry['bytes']
+            FrameCache._count(tracker, 'evictions')
+
+    @staticmethod
+    def clear(tracker=None):
+        """Drops every entry (of one tracker, if given)."""
+        with FrameCache._lock:
+            for key in [k for k in FrameCache._entries if tracker is None or k[0] == tracker]:
+                FrameCache._bytes -= FrameCache._entries.pop(key)['bytes']
+
+    @staticmethod
+    def stats():
+        """Per-tracker cache statistics as a frame (one row per tracker)."""
+        with FrameCache._lock:
+            rows = {}
+            for tracker, counters in FrameCache._stats.items():
+                entries = [e for (t, _), e in FrameCache._entries.items() if t == tracker]
+                rows[tracker] = [len(entries), round(sum(e['bytes'] for e in entries) / 1024 / 1024, 2),
+                                 counters['hits'], counters['patches'], counters['misses'], counters['evictions']]
+        return pd.DataFrame.from_dict(rows, orient='index', columns=STAT_COLUMNS)
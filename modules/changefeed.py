@@ -0,0 +1,89 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from . import config, database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    tracker TEXT NOT NULL,
+    source_hash TEXT,
+    ids TEXT,
+    created_at TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS changes_tracker ON changes (tracker, version);
+CREATE TABLE IF NOT EXISTS pruned (tracker TEXT PRIMARY KEY, version INTEGER NOT NULL);
+"""
+
+class ChangeFeed:
+    """Local change feed shared by every session and server process.
+
+    Each save appends an entry with a monotonically increasing version, the
+    workbook hash it produced and the changed task IDs (None when the whole
+    tracker may have changed). Readers poll `version()` and patch just the
+    listed rows into their in-memory frames instead of reloading everything.
+    """
+
+    @staticmethod
+    def _connect():
+        """Opens the feed database, creating it on first use."""
+        return database.connect(config.CHANGE_FEED_DB, SCHEMA)
+
+    @staticmethod
+    def version(tracker=None):
+        """Returns the latest change version for a tracker (0 if none)."""
+        tracker = tracker or config.TRACKER_FILE
+        try:
+            with closing(ChangeFeed._connect()) as conn:
+                row = conn.execute("SELECT MAX(version) FROM changes WHERE tracker = ?", (tracker,)).fetchone()
+            return row[0] or 0
+        except sqlite3.Error:
+            return 0
+
+    @staticmethod
+    def record(ids=None, source_hash=None, tracker=None):
+        """Appends a change entry and returns its version. `ids=None` means a full change."""
+        tracker = tracker or config.TRACKER_FILE
+        payload = None if ids is None else json.dumps(sorted(int(i) for i in ids))
+        try:
+            with closing(ChangeFeed._connect()) as conn, conn:
+                cur = conn.execute(
+                    "INSERT INTO changes (tracker, source_hash, ids, created_at) VALUES (?, ?, ?, ?)",
+                    (tracker, source_hash, payload, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+                version = cur.lastrowid
+                ChangeFeed._prune(conn, tracker)
+            return version
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def _prune(conn, tracker, keep=None):
+        """Drops all but the newest `keep` entries; readers further behind reload in full."""
+        keep = keep or config.CHANGE_FEED_KEEP
+        row = conn.execute(
+            "SELECT version FROM changes WHERE tracker = ? ORDER BY version DESC LIMIT 1 OFFSET ?",
+            (tracker, keep)).fetchone()
+        if row:
+            conn.execute("DELETE FROM changes WHERE tracker = ? AND version <= ?", (tracker, row[0]))
+            conn.execute("INSERT OR REPLACE INTO pruned (tracker, version) VALUES (?, ?)", (tracker, row[0]))
+
+    @staticmethod
+    def since(version, tracker=None):
+        """Returns the entries after `version`, oldest first.
+
+        Returns None if the reader can't catch up incrementally (entries it
+        needs were pruned, or the feed was reset behind it).
+        """
+        tracker = tracker or config.TRACKER_FILE
+        try:
+            with closing(ChangeFeed._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT version, source_hash, ids FROM changes WHERE tracker = ? AND version > ? ORDER BY version",
+                    (tracker, version)).fetchall()
+                pruned = conn.execute("SELECT version FROM pruned WHERE tracker = ?", (tracker,)).fetchone()
+                latest = conn.execute("SELECT MAX(version) FROM changes WHERE tracker = ?", (tracker,)).fetchone()[0] or 0
+        except sqlite3.Error:
+            return None
+        if (pruned and pruned[0] > version) or latest < version:
+            return None
+        return [{'version': v, 'source_hash': h, 'ids': None if ids is None else json.loads(ids)} for v, h, ids in rows]
@@ -0,0 +1,103 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+import pandas as pd
+from . import config, database
+
+LEGACY_SEPARATOR = " | " # How the CLI used to append comments to the Comments cell
+THREAD_COLUMNS = ['Date', 'Author', 'Comment']
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tracker TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    author TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS comments_task ON comments (tracker, task_id, id);
+CREATE TABLE IF NOT EXISTS imported (tracker TEXT PRIMARY KEY); -- Trackers whose cells were moved in
+"""
+
+def _text(value):
+    """Cell value as text ('' for blanks)."""
+    return '' if value is None or pd.isna(value) else str(value).strip()
+
+class CommentStore:
+    """Append-only comment threads, one per task, kept outside the tracker.
+
+    The workbook's Comments cell only holds each task's latest comment, so
+    long discussions no longer travel with every load, save, backup and
+    data editor payload. Full threads are read per task, on demand.
+    """
+
+    @staticmethod
+    def _connect():
+        """Opens the comment database, creating it on first use."""
+        return database.connect(config.COMMENTS_DB, SCHEMA)
+
+    @staticmethod
+    def add(task_id, body, author, created_at=None, tracker=None):
+        """Appends a comment to a task's thread."""
+        tracker = tracker or config.TRACKER_FILE
+        created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with closing(CommentStore._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO comments (tracker, task_id, author, body, created_at) VALUES (?, ?, ?, ?, ?)",
+                (tracker, int(task_id), author, body, created_at))
+
+    @staticmethod
+    def thread(task_id, tracker=None):
+        """Returns a task's comments, oldest first (Date, Author, Comment)."""
+        tracker = tracker or config.TRACKER_FILE
+        with closing(CommentStore._connect()) as conn:
+            rows = conn.execute(
+                "SELECT created_at, author, body FROM comments WHERE tracker = ? AND task_id = ? ORDER BY id",
+                (tracker, int(task_id))).fetchall()
+        return pd.DataFrame(rows, columns=THREAD_COLUMNS)
+
+    @staticmethod
+    def counts(tracker=None):
+        """Returns the number of comments per task ID (tasks without comments are absent)."""
+        tracker = tracker or config.TRACKER_FILE
+        try:
+            with closing(CommentStore._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT task_id, COUNT(*) FROM comments WHERE tracker = ? GROUP BY task_id", (tracker,)).fetchall()
+        except sqlite3.Error:
+            rows = []
+        return pd.Series(dict(rows), dtype='int64').rename_axis('ID').rename('Comment Count')
+
+    @staticmethod
+    def import_cells(df, tracker=None):
+        """One-time move of Comments cell text into the store, for tasks that have no thread yet.
+
+        Cells written by the old CLI hold a whole history joined with
+        LEGACY_SEPARATOR; each part becomes its own entry and the cell keeps
+        only the latest one. Runs once per tracker: afterwards every writer
+        adds to the threads itself, and a cell read between a save's
+        workbook swap and its thread append must not be imported again.
+        Returns the IDs whose cell was shortened (so the caller can save
+        them), or an empty list.
+        """
+        if 'Comments' not in df.columns:
+            return []
+        tracker = tracker or config.TRACKER_FILE
+        pending = df[df['Comments'].notna() & (df['Comments'].astype(str).str.strip() != '')]
+
+        with closing(CommentStore._connect()) as conn, conn:
+            if conn.execute("SELECT 1 FROM imported WHERE tracker = ?", (tracker,)).fetchone():
+                return []
+            conn.execute("INSERT INTO imported (tracker) VALUES (?)", (tracker,))
+            threaded = {r[0] for r in conn.execute("SELECT DISTINCT task_id FROM comments WHERE tracker = ?", (tracker,))}
+            shortened = []
+            for _, row in pending[~pending['ID'].isin(threaded)].iterrows():
+                parts = [p.strip() for p in str(row['Comments']).split(LEGACY_SEPARATOR) if p.strip()]
+                author = _text(row.get('Last Modified By')) or 'Imported'
+                created_at = _text(row.get('Last Modified Date')) or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                conn.executemany(
+                    "INSERT INTO comments (tracker, task_id, author, body, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(tracker, int(row['ID']), author, part, created_at) for part in parts])
+                if len(parts) > 1:
+                    df.loc[df['ID'] == row['ID'], 'Comments'] = parts[-1]
+                    shortened.append(row['ID'])
+        return shortened
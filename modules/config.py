@@ -3,8 +3,43 @@ import os
 # File Paths
 TRACKER_FILE = "Full_Workplan_Tracker.xlsx"
 SHEET_NAME = "All_Tasks"
+
+# Trackers served by the app and API: name -> (workbook, tasks sheet)
+TRACKERS = {
+    "Full Workplan": (TRACKER_FILE, SHEET_NAME),
+    "SI Manager": ("SI_Manager_Tracker.xlsx", "SI_Tasks"),
+}
+DEFAULT_TRACKER = "Full Workplan"
+# Header fill and column width cap of each tracker sheet, applied on every full rewrite
+SHEET_STYLES = {SHEET_NAME: ("2F75B5", 60), "SI_Tasks": ("1F4E78", 50)}
+CACHE_MAX_MB = 512 # Memory budget of the shared in-memory frame cache (all trackers)
 BACKUP_DIR = "backups"
+SNAPSHOT_DIR = ".cache" # Warm-start snapshots of the cleaned tracker frame
+REPORT_DIR = "reports" # Exported per-region / per-Program-Area workbooks
+
+# Tracker store partitioning (must include 'Fiscal Year'; add 'Region' to split further)
+PARTITION_COLUMNS = ['Fiscal Year']
+DEFAULT_FISCAL_YEAR = "FY26" # For trackers whose tasks carry no budget periods
+
+# Cross-process change feed (SQLite) polled by every session
+CHANGE_FEED_DB = os.path.join(SNAPSHOT_DIR, "changes.db")
+CHANGE_FEED_KEEP = 1000 # Entries kept; sessions further behind reload in full
+LOCK_FILE = os.path.join(SNAPSHOT_DIR, "tracker.lock") # Serialises saves across processes
+
+# Comment threads (append-only); the tracker's Comments cell holds only the latest comment
+COMMENTS_DB = "Workplan_Comments.db"
+
+# Daily progress history (per-task change points) behind the burn-down charts
+HISTORY_DB = "Workplan_History.db"
+
+# Report exports: one workbook per value of each column
+REPORT_GROUPS = ['Region', 'Program Area']
+REPORT_WORKERS = 4
+
+# Task workflow
+STATUS_OPTIONS = ["Pending", "In Progress", "Completed", "Delayed"]
 
-# Ensure backup directory exists
-if not os.path.exists(BACKUP_DIR):
-    os.makedirs(BACKUP_DIR)
+# Ensure backup, cache and report directories exist
+for _dir in (BACKUP_DIR, SNAPSHOT_DIR, REPORT_DIR):
+    if not os.path.exists(_dir):
+        os.makedirs(_dir)
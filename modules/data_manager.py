@@ -4,39 +4,415 @@ import shutil
 from datetime import datetime
 import streamlit as st
 from . import config
+from . import schema
+from . import budgets
+from . import rollups
+from . import excel_writer
+from . import hierarchy
+from .snapshot import Snapshot
+from .changefeed import ChangeFeed
+from .locking import WriteLock
+from .comments import CommentStore
+from .history import ProgressHistory
+from .cache import FrameCache
 
 class DataManager:
+    """Loads and saves the named trackers in config.TRACKERS (tracker=None is config.DEFAULT_TRACKER).
+
+    Loaded frames live in the shared, memory-bounded FrameCache.
+    """
+
+    @staticmethod
+    def trackers():
+        """Returns the names of the configured trackers whose workbook exists."""
+        return [name for name, (path, _) in config.TRACKERS.items() if os.path.exists(path)]
+
+    @staticmethod
+    def _files(tracker=None):
+        """Returns (workbook path, tasks sheet) of a named tracker."""
+        return config.TRACKERS[tracker or config.DEFAULT_TRACKER]
+
+    @staticmethod
+    def load_data(fiscal_years=None, regions=None, copy=True, tracker=None):
+        """Loads data from the Excel file and performs migration if needed.
+        
+        Only the store partitions for `fiscal_years`/`regions` are read (None = all).
+        Pass copy=False for read-only use of the shared in-memory frame.
+        """
+        tables = DataManager._cached_tables(fiscal_years, regions, tracker)
+        if not tables:
+            return None
+        return tables[0].copy() if copy else tables[0]
+
+    @staticmethod
+    def data_version(tracker=None):
+        """Returns an identifier of the tracker's current contents (the workbook hash), or None."""
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
+            return None
+        return Snapshot.file_hash(path)
+
+    @staticmethod
+    def load_budgets(fiscal_years=None, regions=None, tracker=None):
+        """Loads the long budget table (ID, Region, Period, Amount)."""
+        tables = DataManager._cached_tables(fiscal_years, regions, tracker)
+        return tables[1].copy() if tables else None
+
+    @staticmethod
+    def comment_thread(task_id, tracker=None):
+        """Returns a task's full comment thread (Date, Author, Comment)."""
+        return CommentStore.thread(task_id, tracker=DataManager._files(tracker)[0])
+
+    @staticmethod
+    def comment_counts(tracker=None):
+        """Returns the number of comments per task ID."""
+        return CommentStore.counts(tracker=DataManager._files(tracker)[0])
+
+    @staticmethod
+    def progress_history(start, end, by=None, tracker=None):
+        """Daily Tasks / Completed / Remaining / Progress (%) between two dates, per Region or Program Area (`by`)."""
+        return ProgressHistory.completion(start, end, by, tracker=DataManager._files(tracker)[0])
+
+    @staticmethod
+    def history_start(tracker=None):
+        """First day with recorded progress history (ISO date), or None."""
+        return ProgressHistory.first_day(tracker=DataManager._files(tracker)[0])
+
+    @staticmethod
+    def record_history(df, tracker=None):
+        """Records today's per-task Status and Progress (`df` is the whole tracker)."""
+        try:
+            return ProgressHistory.record(df, tracker=DataManager._files(tracker)[0])
+        except Exception as e:
+            st.warning(f"Failed to record progress history: {e}")
+            return 0
+
+    @staticmethod
+    def cache_stats():
+        """Per-tracker statistics of the shared frame cache."""
+        return FrameCache.stats()
+
+    @staticmethod
+    def _cached_tables(fiscal_years=None, regions=None, tracker=None):
+        """Returns (tasks, budgets) for the scope from the in-memory cache.
+        
+        Changes saved by other sessions or processes are picked up from the
+        change feed by patching only the changed rows; anything the feed
+        can't explain (e.g. the workbook edited in Excel) triggers a reload.
+        """
+        tracker = tracker or config.DEFAULT_TRACKER
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
+            return None
+        
+        scope = (tuple(fiscal_years or ()), tuple(regions or ()))
+        version = ChangeFeed.version(path)
+        source_hash = Snapshot.file_hash(path)
+        entry = FrameCache.get(tracker, scope)
+        if entry and entry['source_hash'] == source_hash:
+            entry['version'] = version # Everything recorded so far is already in the workbook we hold
+            FrameCache.hit(tracker)
+            return entry['tables']
+        
+        tables = None
+        if entry:
+            changes = ChangeFeed.since(entry['version'], path)
+            if changes and all(c['ids'] is not None for c in changes) and changes[-1]['source_hash'] == source_hash:
+                changed_ids = sorted({i for c in changes for i in c['ids']})
+                tables = DataManager._patch_rows(entry['tables'], changed_ids, fiscal_years, regions, tracker)
+        counter = 'patches' if tables is not None else 'misses'
+        if tables is None:
+            tables = DataManager._load_tables(fiscal_years, regions, tracker)
+        if tables is not None:
+            FrameCache.put(tracker, scope, {'version': version, 'source_hash': source_hash, 'tables': tables}, counter)
+        return tables
+
+    @staticmethod
+    def _patch_rows(tables, changed_ids, fiscal_years=None, regions=None, tracker=None):
+        """Replaces the rows of `changed_ids` in cached (tasks, budgets) with their stored versions."""
+        path, _ = DataManager._files(tracker)
+        source_hash = Snapshot.file_hash(path)
+        keys = DataManager._select_keys(Snapshot.partitions(path, source_hash), fiscal_years, regions)
+        if not keys:
+            return None
+        patched = []
+        for table, part in zip(tables, ('tasks', 'budgets')):
+            rows = Snapshot.load(path, source_hash, part, keys, ids=changed_ids)
+            if rows is None:
+                return None
+            rows = DataManager._filter_scope(rows, fiscal_years, regions)
+            kept = table[~table['ID'].isin(changed_ids)]
+            patched.append(pd.concat([kept, rows], ignore_index=True).sort_values('ID', kind='stable').reset_index(drop=True))
+        # Budget lines of tasks that left the scope go too
+        patched[1] = patched[1][patched[1]['ID'].isin(patched[0]['ID'])].reset_index(drop=True)
+        return tuple(patched)
+
+    @staticmethod
+    def _cached_view(name, build, fiscal_years=None, regions=None, tracker=None):
+        """Returns a frame derived from the scope's tables, kept in the FrameCache beside them.
+
+        One entry per (tracker, view, scope), rebuilt when the workbook
+        changes, so derived views count against config.CACHE_MAX_MB too.
+        """
+        tracker = tracker or config.DEFAULT_TRACKER
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
+            return None
+        scope = (name, tuple(fiscal_years or ()), tuple(regions or ()))
+        source_hash = Snapshot.file_hash(path)
+        entry = FrameCache.get(tracker, scope)
+        if entry and entry['source_hash'] == source_hash:
+            FrameCache.hit(tracker)
+            return entry['tables'][0]
+        view = build()
+        if view is not None:
+            FrameCache.put(tracker, scope, {'source_hash': source_hash, 'tables': (view,)})
+        return view
+
     @staticmethod
-    def load_data():
-        """Loads data from the Excel file and performs migration if needed."""
-        if not os.path.exists(config.TRACKER_FILE):
+    def load_budget_view(fiscal_years=None, regions=None, tracker=None):
+        """Returns the wide budget view (one row per ID, one column per period)."""
+        def build():
+            budget_df = DataManager.load_budgets(fiscal_years, regions, tracker=tracker)
+            return budgets.pivot(budget_df) if budget_df is not None else None
+        return DataManager._cached_view('budget_view', build, fiscal_years, regions, tracker)
+
+    @staticmethod
+    def load_hierarchy(fiscal_years=None, regions=None, tracker=None):
+        """Returns the workplan hierarchy index of load_data(fiscal_years, regions) (see hierarchy.build)."""
+        def build():
+            df = DataManager.load_data(fiscal_years, regions, copy=False, tracker=tracker)
+            return hierarchy.build(df, DataManager.load_budgets(fiscal_years, regions, tracker=tracker)) if df is not None else None
+        return DataManager._cached_view('hierarchy', build, fiscal_years, regions, tracker)
+
+    @staticmethod
+    def load_rollups(fiscal_years=None, regions=None, tracker=None):
+        """Returns the materialized (status_counts, budget_sums) rollups for the scope."""
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
+            return None
+        keys = DataManager._select_keys(DataManager._partition_keys(tracker), fiscal_years, regions)
+        source_hash = Snapshot.file_hash(path)
+        tables = [Snapshot.load(path, source_hash, name, keys) for name in ('status_rollup', 'budget_rollup')]
+        if any(t is None for t in tables):
+            # No store (e.g. pyarrow missing) or nothing in scope: aggregate the loaded rows instead
+            return rollups.compute(DataManager.load_data(fiscal_years, regions, tracker=tracker),
+                                   DataManager.load_budgets(fiscal_years, regions, tracker))
+        return tuple(DataManager._filter_scope(t, fiscal_years, regions) for t in tables)
+
+    @staticmethod
+    def verify_rollups(fiscal_years=None, regions=None, tracker=None):
+        """Consistency check of the stored rollups against a full recompute."""
+        return rollups.verify(DataManager.load_rollups(fiscal_years, regions, tracker),
+                              DataManager.load_data(fiscal_years, regions, tracker=tracker),
+                              DataManager.load_budgets(fiscal_years, regions, tracker))
+
+    @staticmethod
+    def apply_changes(df, edited_df, user, tracker=None):
+        """Copies edited Status/Progress/Comments from `edited_df` into `df` by ID.
+        
+        Stamps the tracking columns and returns (changed IDs, new comments).
+        Pass both to save_data, which appends the comments to their threads
+        only once the tracker is saved.
+        """
+        tracked = ['Status', 'Progress (%)', 'Comments']
+        updated_rows = edited_df.set_index('ID')
+        
+        changed_ids = []
+        comments = [] # (task ID, text, author, date)
+        for idx, row in updated_rows.iterrows():
+            mask = df['ID'] == idx
+            if mask.any():
+                current_row = df.loc[mask].iloc[0]
+                if any(current_row[col] != row[col] for col in tracked):
+                    for col in tracked:
+                        df.loc[mask, col] = row[col]
+                    
+                    # Update Tracking Info
+                    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    df.loc[mask, 'Last Modified By'] = user
+                    df.loc[mask, 'Last Modified Date'] = now
+                    if row['Comments'] and current_row['Comments'] != row['Comments']:
+                        comments.append((idx, row['Comments'], user, now))
+                    changed_ids.append(idx)
+        return changed_ids, comments
+
+    @staticmethod
+    def add_comment(df, task_id, text, user, fiscal_years=None, tracker=None):
+        """Posts a comment on a task (thread + latest-comment cell) and saves it."""
+        edited = df.loc[df['ID'] == task_id, ['ID', 'Status', 'Progress (%)', 'Comments']].copy()
+        edited['Comments'] = text
+        changed_ids, comments = DataManager.apply_changes(df, edited, user, tracker)
+        if not changed_ids:
+            return False
+        return DataManager.save_data(df, fiscal_years=fiscal_years, changed_ids=changed_ids, comments=comments, tracker=tracker)
+
+    @staticmethod
+    def fiscal_years(tracker=None):
+        """Returns the fiscal years present in the tracker, newest first."""
+        keys = DataManager._partition_keys(tracker)
+        if keys is None:
+            return []
+        idx = config.PARTITION_COLUMNS.index('Fiscal Year')
+        return sorted({k[idx] for k in keys}, reverse=True)
+
+    @staticmethod
+    def iter_partitions(fiscal_years=None, regions=None, tracker=None):
+        """Yields (key, tasks, budgets) one store partition at a time.
+        
+        Cross-year reports should aggregate over this instead of loading every
+        year into one frame.
+        """
+        keys = DataManager._select_keys(DataManager._partition_keys(tracker), fiscal_years, regions)
+        if not keys:
+            return
+        path, _ = DataManager._files(tracker)
+        source_hash = Snapshot.file_hash(path)
+        budget_parts = Snapshot.iter_load(path, source_hash, 'budgets', keys)
+        for (key, df), (_, budget_df) in zip(Snapshot.iter_load(path, source_hash, 'tasks', keys), budget_parts):
+            yield key, df, budget_df
+
+    @staticmethod
+    def fiscal_year_summary(tracker=None):
+        """Task counts by status and total budget per fiscal year, streamed over partitions."""
+        idx = config.PARTITION_COLUMNS.index('Fiscal Year')
+        status_counts = {}
+        budget_totals = {}
+        for key, df, budget_df in DataManager.iter_partitions(tracker=tracker):
+            fy = key[idx]
+            status_counts[fy] = status_counts.get(fy, 0) + df['Status'].value_counts()
+            budget_totals[fy] = budget_totals.get(fy, 0) + budget_df['Amount'].sum()
+        if not status_counts:
+            return pd.DataFrame()
+        summary = pd.DataFrame(status_counts).T.fillna(0).astype(int)
+        summary['Total'] = summary.sum(axis=1)
+        summary['Budget'] = pd.Series(budget_totals)
+        return summary.sort_index(ascending=False)
+
+    @staticmethod
+    def _partition_keys(tracker=None):
+        """Returns the store's partition keys, rebuilding the store if it is stale."""
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
+            return None
+        keys = Snapshot.partitions(path, Snapshot.file_hash(path))
+        if keys is None and DataManager._load_tables(tracker=tracker) is not None:
+            keys = Snapshot.partitions(path, Snapshot.file_hash(path))
+        return keys
+
+    @staticmethod
+    def _select_keys(keys, fiscal_years=None, regions=None):
+        """Filters partition keys down to those the requested scope touches."""
+        if keys is None:
+            return None
+        selected = []
+        for key in keys:
+            values = dict(zip(config.PARTITION_COLUMNS, key))
+            if fiscal_years and 'Fiscal Year' in values and values['Fiscal Year'] not in fiscal_years:
+                continue
+            if regions and 'Region' in values and values['Region'] not in regions:
+                continue
+            selected.append(key)
+        return selected
+
+    @staticmethod
+    def _filter_scope(df, fiscal_years=None, regions=None):
+        """Row-level scope filter for columns that are not partition keys."""
+        if fiscal_years and 'Fiscal Year' in df.columns:
+            df = df[df['Fiscal Year'].isin(fiscal_years)]
+        if regions and 'Region' in df.columns:
+            df = df[df['Region'].isin(regions)]
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _load_tables(fiscal_years=None, regions=None, tracker=None):
+        """Returns (tasks, budgets) for the requested scope.
+        
+        Reads memory-mapped store partitions when the workbook is unchanged,
+        otherwise parses the workbook once and rebuilds the store.
+        """
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
             return None
         
         try:
-            df = pd.read_excel(config.TRACKER_FILE, sheet_name=config.SHEET_NAME)
-            # Ensure Comments is string to avoid Streamlit editing errors
-            if 'Comments' in df.columns:
-                df['Comments'] = df['Comments'].fillna("").astype(str)
-            
-            # Data Cleaning: Remove empty rows and columns
-            df.dropna(how='all', inplace=True) # Drop rows where all elements are NaN
-            df.dropna(axis=1, how='all', inplace=True) # Drop columns where all elements are NaN
-            
-            # Remove rows where 'Program Area' is NaN or empty (critical for stats)
-            if 'Program Area' in df.columns:
-                df = df[df['Program Area'].notna() & (df['Program Area'].astype(str).str.strip() != '')]
+            # Warm start: memory-map only the partitions the scope touches
+            source_hash = Snapshot.file_hash(path)
+            keys = Snapshot.partitions(path, source_hash)
+            if keys is not None:
+                # Nothing in scope: read one partition so the empty result keeps its columns
+                keys = DataManager._select_keys(keys, fiscal_years, regions) or keys[:1]
+                df = Snapshot.load(path, source_hash, 'tasks', keys)
+                budget_df = Snapshot.load(path, source_hash, 'budgets', keys)
+                if df is not None and budget_df is not None:
+                    df = DataManager._filter_scope(df, fiscal_years, regions)
+                    return df, budget_df[budget_df['ID'].isin(df['ID'])].reset_index(drop=True)
+
+            tables = DataManager._parse_workbook(tracker)
+            if tables is None:
+                return None
             
-            # Check for migration to Regional structure
-            if 'Region' not in df.columns:
-                df = DataManager._migrate_to_regions(df)
-                # Save immediately to persist migration
-                DataManager.save_data(df)
-                
-            return df
+            if Snapshot.partitions(path, Snapshot.file_hash(path)) is None:
+                DataManager._save_snapshot(*tables, tracker=tracker)
+                DataManager.record_history(tables[0], tracker) # The workbook may have been edited outside the app
+            df = DataManager._filter_scope(tables[0], fiscal_years, regions)
+            return df, tables[1][tables[1]['ID'].isin(df['ID'])].reset_index(drop=True)
         except Exception as e:
             st.error(f"Error loading data: {e}")
             return None
 
+    @staticmethod
+    def _parse_workbook(tracker=None):
+        """Parses the whole workbook into canonical (tasks, budgets), migrating if needed."""
+        path, sheet = DataManager._files(tracker)
+        # Canonical workbooks (written by save_data or the extractors) need no cleaning
+        with pd.ExcelFile(path) as xls:
+            df = schema.read_tasks(xls, sheet)
+            budget_df = budgets.read_budgets(xls)
+        
+        # Check for migration to Regional structure / long budget table / fiscal year
+        if 'Region' in df.columns and 'Fiscal Year' in df.columns and budget_df is not None:
+            # Move any comment histories out of the Comments cells into their threads (once per tracker)
+            if CommentStore.import_cells(df, tracker=path):
+                DataManager.save_data(df, budget_df, tracker=tracker)
+            return df, budget_df
+        
+        if budget_df is not None:
+            df = budgets.attach(df, budget_df)
+        elif not budgets.period_columns(df):
+            budget_df = pd.DataFrame(columns=budgets.BUDGET_COLUMNS)
+        if 'Fiscal Year' not in df.columns:
+            df.insert(1, 'Fiscal Year', budgets.row_fiscal_years(df, config.DEFAULT_FISCAL_YEAR))
+        if 'Region' not in df.columns:
+            df = DataManager._migrate_to_regions(df)
+        
+        # Save immediately to persist migration
+        df = schema.normalize_tasks(df)
+        CommentStore.import_cells(df, tracker=path)
+        tables = budgets.split(df) if budgets.period_columns(df) else (df, budget_df)
+        DataManager.save_data(*tables, tracker=tracker)
+        return tables
+
+    @staticmethod
+    def _save_snapshot(df, budget_df, rollup_tables=None, tracker=None):
+        """Partitions canonical (tasks, budgets) and their rollups by config.PARTITION_COLUMNS and snapshots them."""
+        cols = config.PARTITION_COLUMNS
+        if rollup_tables is None:
+            rollup_tables = rollups.compute(df, budget_df)
+        # Budget lines belong to their task's partition
+        missing = [c for c in cols if c not in budget_df.columns]
+        tagged = budget_df.join(df.set_index('ID')[missing], on='ID') if missing else budget_df
+        tables = {'tasks': df, 'budgets': tagged, 'status_rollup': rollup_tables[0], 'budget_rollup': rollup_tables[1]}
+        
+        as_key = lambda k: tuple(str(v) for v in (k if isinstance(k, tuple) else (k,)))
+        groups = {name: {as_key(k): part for k, part in table.groupby(cols, sort=False)} for name, table in tables.items()}
+        partitions = {}
+        for key in groups['tasks']:
+            partitions[key] = {name: groups[name].get(key, table.iloc[0:0]) for name, table in tables.items()}
+            partitions[key]['budgets'] = partitions[key]['budgets'].drop(columns=missing)
+        path, _ = DataManager._files(tracker)
+        return Snapshot.save(path, Snapshot.file_hash(path), partitions, cols)
+
     @staticmethod
     def _migrate_to_regions(df):
         """Splits each task into 3 regions and divides budget."""
@@ -45,26 +421,16 @@ class DataManager:
             new_rows = []
             
             # Budget columns to split
-            q1_col = "Oct -Dec 2025"
-            q2_col = "Jan - Mar 2026"
+            period_cols = budgets.period_columns(df)
             
             for _, row in df.iterrows():
                 # Convert budget to numeric for division
-                try:
-                    q1_val = pd.to_numeric(row.get(q1_col, 0), errors='coerce')
-                    if pd.isna(q1_val): q1_val = 0
-                except: q1_val = 0
-                
-                try:
-                    q2_val = pd.to_numeric(row.get(q2_col, 0), errors='coerce')
-                    if pd.isna(q2_val): q2_val = 0
-                except: q2_val = 0
+                amounts = pd.to_numeric(row[period_cols], errors='coerce').fillna(0)
                 
                 for region in regions:
                     new_row = row.copy()
                     new_row['Region'] = region
-                    new_row[q1_col] = q1_val / 3
-                    new_row[q2_col] = q2_val / 3
+                    new_row[period_cols] = amounts / 3
                     new_row['Last Modified By'] = ''
                     new_row['Last Modified Date'] = ''
                     new_rows.append(new_row)
@@ -83,27 +449,66 @@ class DataManager:
             return new_df
 
     @staticmethod
-    def create_backup():
+    def add_fiscal_years(tasks, tracker=None):
+        """Merges an extraction's tasks into an existing tracker, one fiscal year at a time.
+
+        Only fiscal years the tracker doesn't hold yet are added, split into
+        regions like the original migration and numbered after the current
+        IDs; existing tasks keep their status, progress and comments. Years
+        already present are left alone. Returns the years added (None if
+        the tracker couldn't be loaded or saved).
+        """
+        df = DataManager.load_data(tracker=tracker)
+        budget_df = DataManager.load_budgets(tracker=tracker)
+        if df is None or budget_df is None:
+            return None
+        new_years = sorted(set(tasks['Fiscal Year']) - set(df['Fiscal Year']))
+        if not new_years:
+            return []
+
+        added = schema.normalize_tasks(tasks[tasks['Fiscal Year'].isin(new_years)])
+        if 'Region' not in added.columns:
+            added = DataManager._migrate_to_regions(added)
+        added['ID'] = range(int(df['ID'].max()) + 1, int(df['ID'].max()) + 1 + len(added))
+        added, added_budgets = budgets.split(added) if budgets.period_columns(added) else (added, None)
+
+        merged = pd.concat([df, added], ignore_index=True)
+        merged_budgets = pd.concat([budget_df, added_budgets], ignore_index=True)
+        if not DataManager.save_data(merged, merged_budgets, tracker=tracker):
+            return None
+        return new_years
+
+    @staticmethod
+    def create_backup(tracker=None):
         """Creates a timestamped backup of the tracker file."""
-        if not os.path.exists(config.TRACKER_FILE):
+        path, _ = DataManager._files(tracker)
+        if not os.path.exists(path):
             return
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"tracker_backup_{timestamp}.xlsx"
+        prefix = DataManager._backup_prefix(path)
+        backup_filename = f"{prefix}{timestamp}.xlsx"
         backup_path = os.path.join(config.BACKUP_DIR, backup_filename)
         
         try:
-            shutil.copy2(config.TRACKER_FILE, backup_path)
+            shutil.copy2(path, backup_path)
             # Optional: Clean up old backups (keep last 10)
-            DataManager._cleanup_old_backups()
+            DataManager._cleanup_old_backups(prefix=prefix)
         except Exception as e:
             st.warning(f"Failed to create backup: {e}")
 
     @staticmethod
-    def _cleanup_old_backups(keep=10):
-        """Keeps only the last `keep` backups."""
+    def _backup_prefix(path):
+        """Backup file name prefix of a workbook (the default tracker keeps the original name)."""
+        if path == config.TRACKER_FILE:
+            return "tracker_backup_"
+        return f"{os.path.splitext(os.path.basename(path))[0]}_backup_"
+
+    @staticmethod
+    def _cleanup_old_backups(keep=10, prefix="tracker_backup_"):
+        """Keeps only the last `keep` backups of one tracker."""
         try:
-            files = [os.path.join(config.BACKUP_DIR, f) for f in os.listdir(config.BACKUP_DIR) if f.endswith('.xlsx')]
+            files = [os.path.join(config.BACKUP_DIR, f) for f in os.listdir(config.BACKUP_DIR) if f.startswith(prefix) and f.endswith('.xlsx')]
             files.sort(key=os.path.getmtime, reverse=True)
             
             for f in files[keep:]:
@@ -112,17 +517,98 @@ class DataManager:
             pass # Fail silently on cleanup
 
     @staticmethod
-    def save_data(df):
-        """Saves the dataframe to the Excel file after creating a backup."""
+    def save_data(df, budget_df=None, fiscal_years=None, changed_ids=None, comments=None, tracker=None):
+        """Saves the dataframe to the Excel file after creating a backup.
+        
+        Budget period columns in `df` replace the Budgets sheet; otherwise
+        `budget_df`, or the budgets currently on disk, are kept. With
+        `fiscal_years`, `df` only replaces those years and every other
+        partition is kept as stored. With `changed_ids` (and budgets kept),
+        the stored rollups are adjusted by delta instead of recomputed.
+        `comments` (from apply_changes) are appended to their threads once
+        the workbook is written.
+        """
         try:
-            # Create backup first
-            DataManager.create_backup()
-            
-            # Save new data
-            df.to_excel(config.TRACKER_FILE, index=False, sheet_name=config.SHEET_NAME)
-            st.success("Changes saved successfully!")
-            st.cache_data.clear() # Clear cache to reload new data
-            return True
+            with WriteLock.hold():
+                return DataManager._save_locked(df, budget_df, fiscal_years, changed_ids, comments, tracker)
         except Exception as e:
             st.error(f"Error saving data: {e}")
             return False
+
+    @staticmethod
+    def _save_locked(df, budget_df, fiscal_years, changed_ids, comments=None, tracker=None):
+        """Body of save_data; runs while holding the cross-process write lock."""
+        path, sheet = DataManager._files(tracker)
+        rollup_tables = None
+        if changed_ids is not None and budget_df is None and not budgets.period_columns(df):
+            # Apply only this session's edits on top of the latest stored rows,
+            # so changes saved meanwhile by other sessions are not overwritten
+            latest = DataManager.load_data(fiscal_years, tracker=tracker)
+            if latest is not None:
+                edited = df[df['ID'].isin(changed_ids)]
+                df = pd.concat([latest[~latest['ID'].isin(changed_ids)], edited], ignore_index=True)
+                df = df.sort_values('ID', kind='stable').reset_index(drop=True)
+            rollup_tables = DataManager._rollups_after_change(df, changed_ids, tracker)
+        
+        if budgets.period_columns(df):
+            df, budget_df = budgets.split(schema.normalize_tasks(df))
+        elif budget_df is None:
+            budget_df = DataManager.load_budgets(fiscal_years, tracker=tracker)
+        
+        if fiscal_years:
+            df, budget_df = DataManager._merge_other_years(df, budget_df, fiscal_years, tracker)
+        
+        # Create backup first
+        DataManager.create_backup(tracker)
+        
+        tables = None
+        if rollup_tables is not None:
+            # Cell-level edit against the current workbook: patch just those cells, keeping formatting
+            tasks = schema.normalize_tasks(df)
+            rows = tasks[tasks['ID'].isin(changed_ids)].set_index('ID')
+            if excel_writer.patch_workbook(path, sheet, rows):
+                tables = (tasks, budget_df)
+        if tables is None:
+            # Save new data in canonical form, marked so load_data can skip cleaning
+            tables = schema.write_workbook(path, sheet, df, budget_df)
+        # Only now that the tracker holds them do the comments join their threads
+        for comment in comments or []:
+            CommentStore.add(*comment, tracker=path)
+        DataManager._save_snapshot(*tables, rollup_tables, tracker=tracker)
+        ChangeFeed.record(changed_ids, Snapshot.file_hash(path), path)
+        DataManager.record_history(tables[0], tracker)
+        st.success("Changes saved successfully!")
+        st.cache_data.clear() # Clear cache to reload new data
+        return True
+
+    @staticmethod
+    def _rollups_after_change(df, changed_ids, tracker=None):
+        """Stored rollups adjusted for the rows in `changed_ids`, or None if there are none stored."""
+        path, _ = DataManager._files(tracker)
+        source_hash = Snapshot.file_hash(path)
+        # Only the changed rows of the stored tasks are read, so the cost follows the size of the change
+        stored = [Snapshot.load(path, source_hash, 'status_rollup'), Snapshot.load(path, source_hash, 'budget_rollup'),
+                  Snapshot.load(path, source_hash, 'tasks', ids=changed_ids)]
+        if any(t is None for t in stored):
+            return None
+        status_rollup, budget_rollup, before = stored
+        after = df[df['ID'].isin(changed_ids)]
+        # Budgets are unchanged, so only the status counts move
+        return rollups.apply_delta(status_rollup, before, after), budget_rollup
+
+    @staticmethod
+    def _merge_other_years(df, budget_df, fiscal_years, tracker=None):
+        """Adds the stored partitions outside `fiscal_years` back to (tasks, budgets)."""
+        keys = DataManager._partition_keys(tracker)
+        in_scope = set(DataManager._select_keys(keys, fiscal_years))
+        other_keys = [k for k in keys if k not in in_scope]
+        if not other_keys:
+            return df, budget_df
+        
+        path, _ = DataManager._files(tracker)
+        source_hash = Snapshot.file_hash(path)
+        other_df = Snapshot.load(path, source_hash, 'tasks', other_keys)
+        other_budgets = Snapshot.load(path, source_hash, 'budgets', other_keys)
+        merged = pd.concat([other_df, df], ignore_index=True).sort_values('ID', kind='stable')
+        merged_budgets = pd.concat([other_budgets, budget_df], ignore_index=True)
+        return merged.reset_index(drop=True), merged_budgets
@@ -0,0 +1,17 @@
+import os
+import sqlite3
+
+_initialized = set() # Databases whose schema this process has already ensured
+
+def connect(path, schema):
+    """Opens a SQLite database, creating its tables (`schema`, DDL statements) on first use.
+
+    Every store runs in WAL mode, so readers never block the writer.
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    key = os.path.abspath(path)
+    if key not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema)
+        _initialized.add(key)
+    return conn
@@ -0,0 +1,152 @@
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape, unescape
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+# Task cells an edit can touch (the app editor, CLI and API only change these)
+PATCH_COLUMNS = ['Status', 'Progress (%)', 'Comments', 'Last Modified By', 'Last Modified Date']
+
+ROW_PATTERN = re.compile(r'<row\b[^>]*?\br="(\d+)"[^>]*?(?:/>|>(.*?)</row>)', re.S)
+CELL_PATTERN = re.compile(r'<c\b[^>]*?\br="([A-Z]+)(\d+)"[^>]*?(?:/>|>.*?</c>)', re.S)
+STYLE_PATTERN = re.compile(r'\bs="(\d+)"')
+
+def _sheet_path(zf, sheet_name):
+    """Returns the zip member holding `sheet_name`'s XML, or None."""
+    workbook = zf.read('xl/workbook.xml').decode('utf-8')
+    rels = zf.read('xl/_rels/workbook.xml.rels').decode('utf-8')
+    for sheet in re.finditer(r'<sheet\b[^>]*/>', workbook):
+        tag = sheet.group(0)
+        name = re.search(r'\bname="([^"]*)"', tag)
+        rel_id = re.search(r'\br:id="([^"]*)"', tag)
+        if name and rel_id and unescape(name.group(1), {'&quot;': '"'}) == sheet_name:
+            rel = re.search(r'<Relationship\b[^>]*\bId="%s"[^>]*/>' % re.escape(rel_id.group(1)), rels)
+            target = re.search(r'\bTarget="([^"]*)"', rel.group(0)).group(1) if rel else None
+            if target:
+                return target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    return None
+
+def _shared_strings(zf):
+    """Shared string table ([] if the workbook has none, e.g. all text is inline)."""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    xml = zf.read('xl/sharedStrings.xml').decode('utf-8')
+    return [unescape(''.join(re.findall(r'<t\b[^>]*>(.*?)</t>', si, re.S)))
+            for si in re.findall(r'<si>(.*?)</si>', xml, re.S)]
+
+def _cell_value(cell_xml, shared):
+    """Text or number held by a <c> element (None if empty)."""
+    if 't="inlineStr"' in cell_xml:
+        return unescape(''.join(re.findall(r'<t\b[^>]*>(.*?)</t>', cell_xml, re.S)))
+    value = re.search(r'<v>(.*?)</v>', cell_xml, re.S)
+    if value is None:
+        return None
+    if 't="s"' in cell_xml:
+        return shared[int(value.group(1))]
+    return unescape(value.group(1))
+
+def _cell_xml(ref, value, style):
+    """Builds a <c> element for `value`, keeping the cell's style index."""
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value == '':
+        return f'<c r="{ref}"{style_attr}/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = int(value) if float(value).is_integer() else value
+        return f'<c r="{ref}"{style_attr}><v>{number}</v></c>'
+    # Control characters (e.g. \x0b pasted from Excel) aren't allowed in XML and would corrupt the sheet
+    text = ILLEGAL_CHARACTERS_RE.sub('', str(value))
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+def _column_index(letters):
+    """'A' -> 1, 'AB' -> 28."""
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index
+
+def _patch_row(row_xml, row_num, updates, styles):
+    """Replaces/inserts the cells in `updates` (column letter -> value) within one row's XML."""
+    cells = [(m.group(1), m.group(0)) for m in CELL_PATTERN.finditer(row_xml)]
+    existing = {col: xml for col, xml in cells}
+    for col, value in updates.items():
+        old = existing.get(col)
+        style = STYLE_PATTERN.search(old).group(1) if old and STYLE_PATTERN.search(old) else styles.get(col)
+        existing[col] = _cell_xml(f"{col}{row_num}", value, style)
+    return ''.join(existing[col] for col in sorted(existing, key=_column_index))
+
+def patch_workbook(path, sheet_name, rows, columns=PATCH_COLUMNS):
+    """Rewrites only the given cells of a tracker sheet, in place.
+
+    `rows` is a frame indexed by ID holding the new values of `columns`.
+    Works on the sheet XML directly, so header fills, column widths and
+    every other part of the workbook are kept byte for byte. Returns False
+    (without touching the file) when the change can't be expressed as a
+    cell patch, e.g. a column or ID that isn't in the sheet yet; the
+    caller should then rewrite the workbook.
+    """
+    columns = [c for c in columns if c in rows.columns]
+    if rows.empty or not columns:
+        return True
+
+    with zipfile.ZipFile(path) as zf:
+        sheet_path = _sheet_path(zf, sheet_name)
+        if sheet_path is None:
+            return False
+        sheet_xml = zf.read(sheet_path).decode('utf-8')
+
+        row_matches = list(ROW_PATTERN.finditer(sheet_xml))
+        if not row_matches:
+            return False
+        shared = _shared_strings(zf)
+
+        # Header row: column name -> letter (and its data style, taken from row 2)
+        header = {_cell_value(m.group(0), shared): m.group(1) for m in CELL_PATTERN.finditer(row_matches[0].group(2) or '')}
+        if 'ID' not in header or any(c not in header for c in columns):
+            return False
+        styles = {}
+        if len(row_matches) > 1:
+            for m in CELL_PATTERN.finditer(row_matches[1].group(2) or ''):
+                style = STYLE_PATTERN.search(m.group(0))
+                if style:
+                    styles[m.group(1)] = style.group(1)
+
+        # ID -> row match, from the ID column
+        id_col = header['ID']
+        wanted = {int(i) for i in rows.index}
+        targets = {}
+        for match in row_matches[1:]:
+            for cell in CELL_PATTERN.finditer(match.group(2) or ''):
+                if cell.group(1) == id_col:
+                    value = _cell_value(cell.group(0), shared)
+                    try:
+                        task_id = int(float(value))
+                    except (TypeError, ValueError):
+                        break
+                    if task_id in wanted:
+                        targets[task_id] = match
+                    break
+        if len(targets) != len(wanted):
+            return False
+
+        # Splice the patched rows into the sheet XML
+        pieces = []
+        last = 0
+        for task_id, match in sorted(targets.items(), key=lambda t: t[1].start()):
+            row_num = match.group(1)
+            values = rows.loc[task_id, columns]
+            updates = {header[c]: (v.item() if hasattr(v, 'item') else v) for c, v in values.items()}
+            open_tag = re.match(r'<row\b[^>]*?(?=/?>)', match.group(0)).group(0)
+            pieces.append(sheet_xml[last:match.start()])
+            pieces.append(f"{open_tag}>{_patch_row(match.group(2) or '', row_num, updates, styles)}</row>")
+            last = match.end()
+        pieces.append(sheet_xml[last:])
+        new_sheet = ''.join(pieces)
+
+        # Copy every other part unchanged into a new archive, then swap it in atomically
+        tmp_path = path + ".tmp"
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as out:
+            for info in zf.infolist():
+                data = new_sheet.encode('utf-8') if info.filename == sheet_path else zf.read(info)
+                out.writestr(info, data, compress_type=zipfile.ZIP_DEFLATED)
+    os.replace(tmp_path, path)
+    return True
@@ -0,0 +1,119 @@
+import re
+import numpy as np
+import pandas as pd
+from . import budgets
+
+# Workplan levels, outermost first (strategies, objectives and activities share the Activities column)
+LEVELS = ['Strategy', 'Objective', 'Activity', 'Sub-activity', 'ACMS Sub-Activity']
+HEADER_PATTERNS = [re.compile(r'^\s*Strategy\b', re.I), re.compile(r'^\s*Objective\b', re.I)] # Strategy, Objective lines
+ACTIVITY_CODE_PATTERN = re.compile(r'^\s*Activit(?:y|ies)\s+(\d+)\.\s*(\d+)', re.I) # "Activities 1.1.2 ..." -> Strategy 1, Objective 1.1
+NODE_COLUMNS = ['Level', 'Kind', 'Label', 'Parent', 'Start', 'Stop', 'Tasks', 'Completed', 'Progress (%)', 'Budget']
+
+def _labels(df):
+    """Per-row label for each level ('' where the row doesn't name one)."""
+    def text(col):
+        return df[col].fillna('').astype(str).str.strip() if col in df.columns else pd.Series('', index=df.index)
+    activities = text('Activities')
+    headers = [activities.str.match(pattern) for pattern in HEADER_PATTERNS]
+    is_activity = ~pd.concat(headers, axis=1).any(axis=1)
+    return [activities.where(is_header, '') for is_header in headers] + [
+        activities.where(is_activity, ''),
+        text('Code Sub -activities'),
+        text('ACMS Sub-Activities'),
+    ]
+
+def _row_budgets(df, budget_df):
+    """Budget total per row, from the long budget table or the wide period columns."""
+    if budget_df is not None:
+        totals = budget_df.groupby('ID')['Amount'].sum()
+        return df['ID'].map(totals).fillna(0).to_numpy(dtype=float)
+    periods = budgets.period_columns(df)
+    if not periods:
+        return np.zeros(len(df))
+    return df[periods].apply(pd.to_numeric, errors='coerce').fillna(0).sum(axis=1).to_numpy(dtype=float)
+
+def build(df, budget_df=None):
+    """Indexes the workplan hierarchy of `df` (rows in workplan order).
+
+    The extractor flattens Strategy -> Objective -> activity -> Code
+    Sub-activity -> ACMS Sub-Activity with forward fills, so a node is a run of
+    consecutive rows: a blank or repeated label continues the open node,
+    a new one closes it (and everything below it). Returns one row per
+    node with its parent, its row range [Start, Stop) in `df` and subtree
+    totals, so drill-down and rollups need no regrouping.
+
+    Header rows have no Program Area, so normalizing can drop them (the
+    shipped tracker has no Strategy 1 / Objective 1 rows). An activity
+    with no open objective gets its Strategy and Objective from its code.
+    """
+    df = df.reset_index(drop=True)
+    labels = [col.to_numpy() for col in _labels(df)]
+
+    nodes = [] # [level, label, parent, start, stop]
+    open_nodes = [None] * len(LEVELS) # Node number open at each level
+
+    derived = set() # Strategy/Objective nodes taken from activity codes
+    def close(level, row):
+        for lvl in range(level, len(LEVELS)):
+            if open_nodes[lvl] is not None:
+                nodes[open_nodes[lvl]][4] = row
+                open_nodes[lvl] = None
+
+    def open_node(level, label, row):
+        close(level, row)
+        parent = next((open_nodes[lvl] for lvl in range(level - 1, -1, -1) if open_nodes[lvl] is not None), -1)
+        nodes.append([level, label, parent, row, None])
+        open_nodes[level] = len(nodes) - 1
+
+    header_levels = len(HEADER_PATTERNS)
+    for row in range(len(df)):
+        # Strategy/Objective header rows (no ACMS Sub-Activity) carry stale, forward-filled codes
+        header = next((lvl for lvl in range(header_levels) if labels[lvl][row]), None)
+        depth = header + 1 if header is not None and not labels[-1][row] else len(LEVELS)
+        for level in range(depth):
+            label = labels[level][row]
+            current = open_nodes[level]
+            if not label or (current is not None and nodes[current][1] == label):
+                continue
+            code = ACTIVITY_CODE_PATTERN.match(label) if level == header_levels else None
+            if code and (open_nodes[level - 1] is None or open_nodes[level - 1] in derived):
+                for lvl, name in enumerate([f"Strategy {code[1]}", f"Objective {code[1]}.{code[2]}"]):
+                    current = open_nodes[lvl]
+                    if current is None or (current in derived and nodes[current][1] != name):
+                        open_node(lvl, name, row)
+                        derived.add(len(nodes) - 1)
+            open_node(level, label, row)
+    close(0, len(df))
+
+    # Subtree totals from prefix sums: any range costs O(1)
+    progress = pd.to_numeric(df.get('Progress (%)', pd.Series(0, index=df.index)), errors='coerce').fillna(0).to_numpy(dtype=float)
+    completed = (df['Status'] == 'Completed').to_numpy(dtype=float) if 'Status' in df.columns else np.zeros(len(df))
+    prefix = {name: np.concatenate([[0], np.cumsum(values)])
+              for name, values in (('Completed', completed), ('Progress', progress), ('Budget', _row_budgets(df, budget_df)))}
+
+    index = pd.DataFrame(nodes, columns=['Level', 'Label', 'Parent', 'Start', 'Stop'])
+    start, stop = index['Start'].to_numpy(), index['Stop'].to_numpy()
+    index['Kind'] = [LEVELS[level] for level in index['Level']]
+    index['Tasks'] = stop - start
+    index['Completed'] = (prefix['Completed'][stop] - prefix['Completed'][start]).astype(int)
+    index['Progress (%)'] = np.divide(prefix['Progress'][stop] - prefix['Progress'][start], index['Tasks'],
+                                      out=np.zeros(len(index)), where=index['Tasks'].to_numpy() > 0).round(1)
+    index['Budget'] = prefix['Budget'][stop] - prefix['Budget'][start]
+    return index[NODE_COLUMNS].rename_axis('Node')
+
+def children(index, node=-1):
+    """Direct children of `node` (-1 for the top level)."""
+    return index[index['Parent'] == node]
+
+def rows(df, index, node):
+    """The task rows under `node`."""
+    start, stop = index.loc[node, ['Start', 'Stop']]
+    return df.iloc[start:stop]
+
+def path(index, node):
+    """Nodes from the top level down to `node`."""
+    chain = []
+    while node != -1:
+        chain.append(node)
+        node = index.at[node, 'Parent']
+    return index.loc[chain[::-1]]
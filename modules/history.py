@@ -0,0 +1,152 @@
+import sqlite3
+from contextlib import closing
+from datetime import date
+import pandas as pd
+from . import config, database
+
+# Tracker column -> history column; the columns completion() can group by
+GROUP_COLUMNS = {'Region': 'region', 'Program Area': 'program_area'}
+HISTORY_COLUMNS = ['task_id', 'region', 'program_area', 'status', 'progress']
+TREND_COLUMNS = ['Tasks', 'Completed', 'Remaining', 'Progress (%)']
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS states (
+    tracker TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    region TEXT,
+    program_area TEXT,
+    status TEXT,
+    progress REAL,
+    PRIMARY KEY (tracker, task_id, day));
+CREATE INDEX IF NOT EXISTS states_day ON states (tracker, day);
+"""
+
+def _day(value=None):
+    """ISO day ('YYYY-MM-DD') of a date, timestamp or string (default: today)."""
+    return pd.Timestamp(value).date().isoformat() if value is not None else date.today().isoformat()
+
+def _states(df):
+    """Per-task state rows (task_id, region, program_area, status, progress) of a task table."""
+    def text(col):
+        return df[col].fillna('').astype(str).str.strip() if col in df.columns else pd.Series('', index=df.index)
+    progress = pd.to_numeric(df['Progress (%)'], errors='coerce') if 'Progress (%)' in df.columns else pd.Series(0.0, index=df.index)
+    return pd.DataFrame({
+        'task_id': df['ID'].astype(int),
+        'region': text('Region'),
+        'program_area': text('Program Area'),
+        'status': text('Status'),
+        'progress': progress.fillna(0).astype(float).round(2),
+    })
+
+class ProgressHistory:
+    """Daily per-task Status and Progress, kept as change points.
+
+    A task gets a row only on the days its state (status, progress, region
+    or Program Area) differs from its previous row, so a tracker that
+    mostly sits still costs almost nothing per day. The state of any task
+    on any day is its latest row up to that day; a task that left the
+    tracker gets a row with no status.
+    """
+
+    @staticmethod
+    def _connect():
+        """Opens the history database, creating it on first use."""
+        return database.connect(config.HISTORY_DB, SCHEMA)
+
+    @staticmethod
+    def _as_of(conn, tracker, day):
+        """Each task's latest row up to `day` (tasks seen by then only)."""
+        return pd.read_sql_query(
+            """SELECT s.task_id, s.region, s.program_area, s.status, s.progress FROM states s
+               JOIN (SELECT task_id, MAX(day) AS day FROM states WHERE tracker = ? AND day <= ? GROUP BY task_id) latest
+               USING (task_id, day) WHERE s.tracker = ?""",
+            conn, params=(tracker, day, tracker))
+
+    @staticmethod
+    def record(df, day=None, tracker=None):
+        """Records the state of every task in `df` (the whole tracker) for `day` (default: today).
+
+        Only tasks whose state changed are written, and recording the same
+        day again overwrites that day's rows, so this can run on every save
+        as well as on a schedule. Returns the number of rows written.
+        """
+        tracker = tracker or config.TRACKER_FILE
+        day = _day(day)
+        current = _states(df).drop_duplicates('task_id', keep='last')
+        with closing(ProgressHistory._connect()) as conn, conn:
+            previous = ProgressHistory._as_of(conn, tracker, day)
+            previous = previous[previous['status'].notna()]
+            merged = current.merge(previous, on='task_id', how='outer', suffixes=('', '_previous'), indicator=True)
+
+            changed = merged['_merge'] == 'left_only'
+            for col in HISTORY_COLUMNS[1:]:
+                changed |= (merged['_merge'] == 'both') & (merged[col] != merged[f'{col}_previous'])
+            rows = merged.loc[changed, HISTORY_COLUMNS]
+            # Tasks no longer in the tracker
+            removed = merged.loc[merged['_merge'] == 'right_only', ['task_id', 'region_previous', 'program_area_previous']]
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO states (tracker, task_id, day, region, program_area, status, progress) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(tracker, int(r.task_id), day, r.region, r.program_area, r.status, float(r.progress)) for r in rows.itertuples()]
+                + [(tracker, int(r[0]), day, r[1], r[2], None, None) for r in removed.itertuples(index=False)])
+        return len(rows) + len(removed)
+
+    @staticmethod
+    def first_day(tracker=None):
+        """The first day with recorded history, or None."""
+        tracker = tracker or config.TRACKER_FILE
+        try:
+            with closing(ProgressHistory._connect()) as conn:
+                row = conn.execute("SELECT MIN(day) FROM states WHERE tracker = ?", (tracker,)).fetchone()
+            return row[0]
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def completion(start, end, by=None, tracker=None):
+        """Daily task counts between `start` and `end` (inclusive), per value of `by` ('Region', 'Program Area' or None).
+
+        Returns Day, [by,] Tasks, Completed, Remaining and average
+        Progress (%). Reads only the state at `start` plus the change points
+        in the range, and turns them into per-day deltas, so the cost
+        follows the number of changes rather than tasks x days.
+        """
+        if by is not None and by not in GROUP_COLUMNS:
+            raise ValueError(f"Can only group by {', '.join(GROUP_COLUMNS)}")
+        tracker = tracker or config.TRACKER_FILE
+        start, end = _day(start), _day(end)
+        with closing(ProgressHistory._connect()) as conn:
+            baseline = ProgressHistory._as_of(conn, tracker, start).assign(day=start)
+            changes = pd.read_sql_query(
+                "SELECT task_id, region, program_area, status, progress, day FROM states WHERE tracker = ? AND day > ? AND day <= ?",
+                conn, params=(tracker, start, end))
+        events = pd.concat([baseline, changes], ignore_index=True).sort_values(['task_id', 'day'], kind='stable')
+        if events.empty:
+            return pd.DataFrame(columns=['Day'] + ([by] if by else []) + TREND_COLUMNS)
+
+        group = GROUP_COLUMNS.get(by)
+        events['group'] = events[group] if group else 'All'
+        present = events['status'].notna()
+        events['Tasks'] = present.astype(int)
+        events['Completed'] = (events['status'] == 'Completed').astype(int)
+        events['Progress'] = pd.to_numeric(events['progress'].where(present, 0)).fillna(0).astype(float)
+
+        # Each change point adds the task's new state to its group and takes back its previous one
+        values = ['Tasks', 'Completed', 'Progress']
+        previous = events.groupby('task_id')[['group'] + values].shift()
+        retract = previous[previous['group'].notna()].assign(day=events['day'])
+        retract[values] = -retract[values]
+        deltas = pd.concat([events[['day', 'group'] + values], retract[['day', 'group'] + values]])
+
+        days = pd.date_range(start, end, freq='D')
+        daily = deltas.groupby(['day', 'group'])[values].sum().unstack('group', fill_value=0)
+        daily.index = pd.to_datetime(daily.index)
+        daily = daily.reindex(days, fill_value=0).cumsum()
+
+        groups = daily.columns.get_level_values('group').unique()
+        trend = pd.concat({g: daily.xs(g, axis=1, level='group') for g in groups}, names=[by or 'group', 'Day'])
+        trend = trend.reset_index().sort_values(['Day', by or 'group'], kind='stable', ignore_index=True)
+        trend['Remaining'] = trend['Tasks'] - trend['Completed']
+        trend['Progress (%)'] = (trend['Progress'] / trend['Tasks'].where(trend['Tasks'] > 0)).fillna(0).round(1)
+        trend[['Tasks', 'Completed', 'Remaining']] = trend[['Tasks', 'Completed', 'Remaining']].astype(int)
+        return trend[['Day'] + ([by] if by else []) + TREND_COLUMNS]
@@ -0,0 +1,46 @@
+import threading
+from contextlib import contextmanager
+from . import config
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+class WriteLock:
+    """Re-entrant lock serialising tracker writes across threads and processes.
+
+    Threads in one process (Streamlit sessions, API workers) share an RLock;
+    processes coordinate through an OS lock on config.LOCK_FILE.
+    """
+
+    _thread_lock = threading.RLock()
+    _depth = 0
+    _handle = None
+
+    @staticmethod
+    @contextmanager
+    def hold():
+        """Holds the write lock for the duration of the `with` block."""
+        with WriteLock._thread_lock:
+            if WriteLock._depth == 0:
+                WriteLock._handle = open(config.LOCK_FILE, 'a+')
+                if fcntl:
+                    fcntl.flock(WriteLock._handle.fileno(), fcntl.LOCK_EX)
+                else:
+                    WriteLock._handle.seek(0)
+                    msvcrt.locking(WriteLock._handle.fileno(), msvcrt.LK_LOCK, 1)
+            WriteLock._depth += 1
+            try:
+                yield
+            finally:
+                WriteLock._depth -= 1
+                if WriteLock._depth == 0:
+                    if fcntl:
+                        fcntl.flock(WriteLock._handle.fileno(), fcntl.LOCK_UN)
+                    else:
+                        WriteLock._handle.seek(0)
+                        msvcrt.locking(WriteLock._handle.fileno(), msvcrt.LK_UNLCK, 1)
+                    WriteLock._handle.close()
+                    WriteLock._handle = None
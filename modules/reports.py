@@ -0,0 +1,138 @@
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font
+from openpyxl.utils import get_column_letter
+from . import config
+
+# Same header style as the extraction scripts
+HEADER_FILL = "2F75B5"
+MAX_COLUMN_WIDTH = 60
+
+_runner = ThreadPoolExecutor(max_workers=1) # Runs exports off the caller's thread, one at a time
+_jobs = {} # (version, scope, groups, tracker) -> Future of the running/finished export
+_jobs_lock = threading.Lock()
+
+def _slug(value):
+    """File-name-safe form of a column or group value."""
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(value)).strip('_') or 'blank'
+
+def _tracker_dir(tracker=None):
+    """Directory holding all reports of a named tracker."""
+    return os.path.join(config.REPORT_DIR, _slug(tracker or config.DEFAULT_TRACKER))
+
+def report_dir(scope=None, tracker=None):
+    """Directory holding the reports for `scope` (e.g. the fiscal years)."""
+    return os.path.join(_tracker_dir(tracker), _slug('_'.join(scope)) if scope else 'all')
+
+def report_path(scope, column, value, digest, tracker=None):
+    """Path of the report for rows where `column` == `value`, whose content hashes to `digest`."""
+    return os.path.join(report_dir(scope, tracker), f"{_slug(column)}_{_slug(value)}_{digest}.xlsx")
+
+def _digest(group):
+    """Hash of one report's columns and rows: a report is rebuilt only when its own rows change."""
+    h = hashlib.sha256('\x1f'.join(map(str, group.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(group, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+def write_report(path, title, columns, rows):
+    """Streams one formatted report workbook to `path` (runs in a worker process).
+
+    Uses openpyxl's write-only mode, so rows go straight to the sheet XML
+    instead of being held as cell objects; widths are taken from the data
+    up front since they can't be adjusted afterwards.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(re.sub(r'[\[\]:*?/\\]', ' ', title)[:31])
+    ws.freeze_panes = 'A2'
+
+    for i, col in enumerate(columns):
+        longest = max([len(str(col))] + [len(str(row[i])) for row in rows if row[i] is not None])
+        ws.column_dimensions[get_column_letter(i + 1)].width = min(longest + 2, MAX_COLUMN_WIDTH)
+
+    fill = PatternFill(start_color=HEADER_FILL, end_color=HEADER_FILL, fill_type="solid")
+    font = Font(color="FFFFFF", bold=True)
+    header = []
+    for col in columns:
+        cell = WriteOnlyCell(ws, value=col)
+        cell.fill = fill
+        cell.font = font
+        header.append(cell)
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+
+    # Write beside the final name, so a half-written report is never mistaken for a cached one
+    tmp_path = path + ".tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def _rows(df):
+    """Plain Python rows (blanks as None) for sending to a worker."""
+    values = df.astype(object).where(df.notna(), None)
+    return [tuple(v.item() if hasattr(v, 'item') else v for v in row) for row in values.itertuples(index=False, name=None)]
+
+def export(df, scope=None, groups=None, workers=None, tracker=None):
+    """Builds one report per value of each column in `groups`.
+
+    `df` is the wide task table (budget periods as columns) and `scope`
+    the fiscal years it covers (None = all). Each report is keyed on a hash of its own rows, so after
+    an edit only the groups containing the edited rows are rewritten; the
+    rest are written in parallel. Returns a dict of (column, value) ->
+    report path.
+    """
+    groups = groups or config.REPORT_GROUPS
+    out_dir = report_dir(scope, tracker)
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = {}
+    pending = []
+    columns = df.columns.tolist()
+    for column in groups:
+        if column not in df.columns:
+            continue
+        for value, group in df.groupby(column, sort=True):
+            path = report_path(scope, column, value, _digest(group), tracker)
+            paths[(column, value)] = path
+            if not os.path.exists(path):
+                pending.append((path, f"{value}", columns, _rows(group)))
+
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers or config.REPORT_WORKERS) as pool:
+            list(pool.map(write_report, *zip(*pending)))
+    elif pending:
+        write_report(*pending[0])
+
+    # Superseded reports (rows since changed, or groups gone) are stale now
+    current = {os.path.basename(p) for p in paths.values()}
+    for name in os.listdir(out_dir):
+        if name.endswith('.xlsx') and name not in current:
+            os.remove(os.path.join(out_dir, name))
+    return paths
+
+def start_export(df, version, scope=None, groups=None, tracker=None):
+    """Starts `export` in the background and returns its Future.
+
+    Requests for a data version and scope that is already being (or has
+    been) exported share the same job.
+    """
+    key = (version, tuple(scope or ()), tuple(groups or config.REPORT_GROUPS), tracker)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None or (job.done() and job.exception() is not None):
+            job = _runner.submit(export, df.copy(), scope, groups, tracker=tracker)
+            for old in [k for k in _jobs if k[3] == tracker and k[0] != version]:
+                del _jobs[old] # Only the latest version's jobs are worth keeping
+            _jobs[key] = job
+        return job
+
+def running():
+    """Export jobs that haven't finished yet."""
+    with _jobs_lock:
+        return [job for job in _jobs.values() if not job.done()]
@@ -0,0 +1,82 @@
+# Materialized rollups kept in the tracker store next to the tasks
+STATUS_KEYS = ['Fiscal Year', 'Region', 'Program Area', 'Status']
+BUDGET_KEYS = ['Fiscal Year', 'Region', 'Program Area', 'Period']
+
+def _totals(rows, keys, value):
+    """Sums `value` over `keys`; rows without a `value` column count as 1 each."""
+    if value not in rows.columns:
+        rows = rows.assign(**{value: 1})
+    return rows.groupby(keys)[value].sum()
+
+def _finish(totals, value):
+    """Drops groups with no tasks and flattens a totals series back into a table."""
+    if value == 'Count':
+        totals = totals[totals != 0].astype(int)
+    return totals.rename(value).reset_index()
+
+def status_counts(df):
+    """Task counts per Fiscal Year x Region x Program Area x Status."""
+    keys = [c for c in STATUS_KEYS if c in df.columns]
+    return _finish(_totals(df, keys, 'Count'), 'Count')
+
+def budget_sums(df, budget_df):
+    """Budget totals per Fiscal Year x Region x Program Area x Period."""
+    task_cols = [c for c in BUDGET_KEYS if c in df.columns and c not in budget_df.columns]
+    lines = budget_df.join(df.set_index('ID')[task_cols], on='ID', how='inner')
+    keys = [c for c in BUDGET_KEYS if c in lines.columns]
+    return _finish(_totals(lines, keys, 'Amount'), 'Amount')
+
+def compute(df, budget_df):
+    """Full recompute of (status_counts, budget_sums)."""
+    return status_counts(df), budget_sums(df, budget_df)
+
+def apply_delta(rollup, before, after):
+    """Adjusts a rollup for rows that changed from `before` to `after`.
+
+    `before`/`after` are the affected rows (task rows for status counts,
+    budget lines for budget sums) with the rollup's key columns. Only
+    their groups are touched, so the cost follows the size of the change.
+    """
+    value = 'Count' if 'Count' in rollup.columns else 'Amount'
+    keys = [c for c in rollup.columns if c != value]
+    delta = _totals(after, keys, value).sub(_totals(before, keys, value), fill_value=0)
+    if rollup.empty:
+        return _finish(delta, value)
+    return _finish(rollup.set_index(keys)[value].add(delta, fill_value=0), value)
+
+def verify(rollup_tables, df, budget_df):
+    """Consistency check: True if the rollups match a full recompute."""
+    def canonical(table):
+        # Zero-budget groups are kept by compute but may vanish or linger after deltas
+        value = table.columns[-1]
+        table = table[table[value].abs() >= 0.005]
+        return table.sort_values(list(table.columns[:-1])).reset_index(drop=True)
+
+    expected = compute(df, budget_df)
+    for actual, wanted in zip(rollup_tables, expected):
+        actual, wanted = canonical(actual), canonical(wanted)
+        if list(actual.columns) != list(wanted.columns) or len(actual) != len(wanted):
+            return False
+        value = actual.columns[-1]
+        keys = list(actual.columns[:-1])
+        if not actual[keys].astype(str).equals(wanted[keys].astype(str)):
+            return False
+        if not ((actual[value] - wanted[value]).abs() < 0.005).all():
+            return False
+    return True
+
+def select(rollup, selection):
+    """Rows of a rollup for a sidebar selection, or None if it can't be answered from the rollup.
+
+    Region and Program Area (and Status, for status counts) are rollup keys;
+    a search, or a Status filter on budget sums, needs the line items.
+    """
+    if selection.get('Search'):
+        return None
+    for col, value in selection.items():
+        if value in (None, "All") or col == 'Search':
+            continue
+        if col not in rollup.columns:
+            return None
+        rollup = rollup[rollup[col] == value]
+    return rollup
@@ -0,0 +1,106 @@
+import os
+import pandas as pd
+from openpyxl.styles import PatternFill, Font
+from openpyxl.utils import get_column_letter
+from . import budgets, config
+
+# Bump whenever normalize_tasks changes what a canonical table looks like
+SCHEMA_VERSION = 4
+META_SHEET = "_Schema"
+
+NUMERIC_COLUMNS = ['ID', 'Progress (%)'] # Plus any budget period columns
+KEEP_COLUMNS = ['Fiscal Year', 'Comments', 'Assigned To', 'Last Modified By', 'Last Modified Date'] # Kept even when every cell is blank
+
+def normalize_tasks(df):
+    """Returns the canonical form of a task table.
+
+    Blank rows/columns and rows without a Program Area are dropped, numeric
+    columns are filled with 0, and every other column is plain text with ''
+    for blanks. A table written in this form can be read back with
+    `read_tasks` and used without any further cleaning.
+    """
+    df = df.replace("", None).dropna(how='all')
+    blank_cols = [c for c in df.columns if c not in KEEP_COLUMNS and df[c].isna().all()]
+    df = df.drop(columns=blank_cols)
+
+    numeric_cols = NUMERIC_COLUMNS + budgets.period_columns(df)
+    for col in df.columns:
+        if col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        else:
+            # Mixed columns (e.g. a stray number among labels) become text too
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str)).fillna("").astype(str)
+
+    if 'Program Area' in df.columns:
+        df['Program Area'] = df['Program Area'].str.strip()
+        df = df[~df['Program Area'].isin(['', 'nan'])]
+
+    if 'ID' in df.columns:
+        df['ID'] = df['ID'].astype(int)
+    if 'Progress (%)' in df.columns:
+        df['Progress (%)'] = df['Progress (%)'].round().astype(int) # Whole percents, as the editor and API take them
+
+    return df.reset_index(drop=True)
+
+def write_marker(wb):
+    """Adds a hidden sheet to an openpyxl workbook recording the schema version."""
+    if META_SHEET in wb.sheetnames:
+        del wb[META_SHEET]
+    ws = wb.create_sheet(META_SHEET)
+    ws.append(['key', 'value'])
+    ws.append(['schema_version', SCHEMA_VERSION])
+    ws.sheet_state = 'hidden'
+
+def read_marker(xls):
+    """Returns the schema version recorded in a pd.ExcelFile, or None."""
+    if META_SHEET not in xls.sheet_names:
+        return None
+    meta = pd.read_excel(xls, sheet_name=META_SHEET)
+    versions = meta.loc[meta['key'] == 'schema_version', 'value']
+    return int(versions.iloc[0]) if not versions.empty else None
+
+def read_tasks(xls, sheet_name):
+    """Reads a task sheet, normalizing it only if it lacks a current marker."""
+    if read_marker(xls) == SCHEMA_VERSION:
+        # Already canonical: keep blanks as '' instead of re-cleaning NaNs
+        return pd.read_excel(xls, sheet_name=sheet_name, na_filter=False)
+    return normalize_tasks(pd.read_excel(xls, sheet_name=sheet_name))
+
+def _format_sheet(ws, df, sheet_name):
+    """Coloured bold header and column widths fitted to the content (capped)."""
+    color, max_width = config.SHEET_STYLES.get(sheet_name, config.SHEET_STYLES[config.SHEET_NAME])
+    fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    font = Font(color="FFFFFF", bold=True)
+    for cell in ws[1]:
+        cell.fill = fill
+        cell.font = font
+    for number, col in enumerate(df.columns, 1):
+        lengths = df[col].astype(str).str.len()
+        longest = max(len(str(col)), lengths.max() if len(lengths) else 0)
+        ws.column_dimensions[get_column_letter(number)].width = min(longest + 2, max_width)
+
+def write_workbook(path, sheet_name, df, budget_table=None):
+    """Writes a tracker workbook in canonical form and returns (tasks, budgets).
+
+    Wide budget period columns in `df` are moved into the long Budgets sheet;
+    otherwise `budget_table` (if given) is written as the Budgets sheet. The
+    task sheet gets its header fill and column widths (config.SHEET_STYLES)
+    on every write, so migrations and full saves keep the extractor's look.
+    """
+    df = normalize_tasks(df)
+    if budgets.period_columns(df):
+        df, budget_table = budgets.split(df)
+    elif budget_table is not None:
+        budget_table = budgets.normalize(budget_table[budget_table['ID'].isin(df['ID'])])
+
+    # Write beside the tracker and swap it in, so concurrent readers never see a half-written file
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}" # pandas picks the writer from the extension
+    with pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+        _format_sheet(writer.sheets[sheet_name], df, sheet_name)
+        if budget_table is not None:
+            budget_table.to_excel(writer, index=False, sheet_name=budgets.BUDGET_SHEET)
+        write_marker(writer.book)
+    os.replace(tmp_path, path)
+    return df, budget_table
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+from . import config
+
+class Snapshot:
+    """Partitioned binary (Arrow/Feather) snapshot of the cleaned tracker tables.
+
+    Each partition (e.g. one fiscal year, optionally one region) holds one
+    Feather file per table ('tasks', 'budgets', ...). The snapshot is keyed
+    by the SHA-256 of the source workbook, so a warm start can memory-map
+    only the partitions it needs instead of re-parsing the Excel XML. Any
+    mismatch simply means the caller falls back to a full parse.
+    """
+
+    _hashes = {} # path -> (mtime_ns, size, digest), so unchanged files are hashed once
+
+    @staticmethod
+    def file_hash(path):
+        """Returns the SHA-256 hex digest of a file."""
+        stat = os.stat(path)
+        cached = Snapshot._hashes.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        Snapshot._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _dir(source):
+        """Returns the snapshot directory for `source`."""
+        return os.path.join(config.SNAPSHOT_DIR, os.path.splitext(os.path.basename(source))[0])
+
+    @staticmethod
+    def _manifest(source, source_hash):
+        """Returns the snapshot manifest if it matches `source_hash`, else None."""
+        manifest_path = os.path.join(Snapshot._dir(source), "manifest.json")
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('source_hash') == source_hash else None
+
+    @staticmethod
+    def partitions(source, source_hash):
+        """Returns the partition keys (tuples) of a current snapshot, or None."""
+        manifest = Snapshot._manifest(source, source_hash)
+        if manifest is None:
+            return None
+        return [tuple(p['key']) for p in manifest['partitions']]
+
+    @staticmethod
+    def iter_load(source, source_hash, part, keys=None, ids=None):
+        """Yields (key, frame) for each partition of table `part`, memory-mapped.
+
+        `keys` restricts the partitions read (None reads all of them) and
+        `ids` the rows converted to pandas. Yields nothing if the snapshot
+        is missing or stale.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            from pyarrow import feather
+        except ImportError:
+            return
+
+        manifest = Snapshot._manifest(source, source_hash)
+        if manifest is None:
+            return
+
+        wanted = None if keys is None else {tuple(k) for k in keys}
+        data_dir = os.path.join(Snapshot._dir(source), manifest['dir'])
+        for p in manifest['partitions']:
+            key = tuple(p['key'])
+            if wanted is not None and key not in wanted:
+                continue
+            table = feather.read_table(os.path.join(data_dir, p['files'][part]), memory_map=True)
+            if ids is not None:
+                table = table.filter(pc.is_in(table['ID'], value_set=pa.array(list(ids), type=table.schema.field('ID').type)))
+            yield key, table.to_pandas()
+
+    @staticmethod
+    def load(source, source_hash, part, keys=None, ids=None):
+        """Loads table `part` (only rows in `ids`, if given) from the partitions in `keys`, or None if not available."""
+        if Snapshot._manifest(source, source_hash) is None:
+            return None
+        try:
+            frames = [df for _, df in Snapshot.iter_load(source, source_hash, part, keys, ids)]
+        except Exception:
+            return None # Corrupt or incompatible snapshot, rebuild from source
+        if not frames:
+            return None
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if len(frames) > 1 and 'ID' in df.columns:
+            df = df.sort_values('ID', kind='stable').reset_index(drop=True)
+        return df
+
+    @staticmethod
+    def save(source, source_hash, partitions, columns):
+        """Writes a snapshot. Returns True on success.
+
+        `partitions` maps a key tuple (values of `columns`) to a dict of
+        table name -> frame.
+        """
+        try:
+            from pyarrow import feather
+        except ImportError:
+            return False
+
+        base_dir = Snapshot._dir(source)
+        data_dir_name = source_hash[:16]
+        data_dir = os.path.join(base_dir, data_dir_name)
+        try:
+            os.makedirs(data_dir, exist_ok=True)
+            entries = []
+            for i, (key, tables) in enumerate(sorted(partitions.items())):
+                files = {}
+                for part, df in tables.items():
+                    files[part] = f"{i:04d}.{part}.feather"
+                    feather.write_feather(df.reset_index(drop=True), os.path.join(data_dir, files[part]), compression='uncompressed')
+                entries.append({'key': list(key), 'rows': len(tables.get('tasks', [])), 'files': files})
+
+            # Swap the manifest in atomically, so readers never see a half-written snapshot
+            manifest = {'source_hash': source_hash, 'dir': data_dir_name, 'columns': list(columns), 'partitions': entries}
+            manifest_path = os.path.join(base_dir, "manifest.json")
+            with open(manifest_path + ".tmp", 'w') as f:
+                json.dump(manifest, f)
+            os.replace(manifest_path + ".tmp", manifest_path)
+
+            # Drop superseded snapshot versions (may fail while another process has them mapped)
+            for name in os.listdir(base_dir):
+                path = os.path.join(base_dir, name)
+                if name != data_dir_name and os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+            return True
+        except Exception:
+            return False # Snapshot is an optimisation only
@@ -1,5 +1,10 @@
+import os
+from datetime import date, timedelta
 import streamlit as st
-import pandas as pd
+from . import budgets
+from . import config
+from . import hierarchy
+from . import reports
 
 def setup_page():
     """Configures the Streamlit page and adds custom CSS."""
@@ -34,8 +39,12 @@ def setup_page():
         </style>
         """, unsafe_allow_html=True)
 
-def render_metrics(original_df, filtered_df=None):
-    """Displays key metrics, optionally comparing filtered vs overall."""
+def render_metrics(original_df, filtered_df=None, status_rollup=None):
+    """Displays key metrics, optionally comparing filtered vs overall.
+
+    `status_rollup` (counts per Region x Program Area x Status) feeds the
+    Program Area breakdown when available.
+    """
     
     # If no filtered df provided or it's the same as original, just show original stats
     if filtered_df is None or len(filtered_df) == len(original_df):
@@ -44,7 +53,10 @@ def render_metrics(original_df, filtered_df=None):
         
         # Show breakdown by Program Area
         st.markdown("#### Status by Program Area")
-        breakdown = original_df.groupby(['Program Area', 'Status']).size().unstack(fill_value=0)
+        if status_rollup is not None:
+            breakdown = status_rollup.groupby(['Program Area', 'Status'])['Count'].sum().unstack(fill_value=0)
+        else:
+            breakdown = original_df.groupby(['Program Area', 'Status']).size().unstack(fill_value=0)
         breakdown['Total'] = breakdown.sum(axis=1)
         breakdown = breakdown.sort_values('Total', ascending=False)
         st.dataframe(breakdown, use_container_width=True)
@@ -105,8 +117,38 @@ def render_login():
         
     return True
 
+def render_tracker_selector(trackers):
+    """Renders the tracker selector and returns the chosen tracker name (None if none exist)."""
+    if len(trackers) <= 1:
+        return trackers[0] if trackers else None
+    return st.sidebar.selectbox("Tracker", trackers)
+
+def render_cache_stats(stats):
+    """Shows the shared frame cache's per-tracker statistics."""
+    with st.sidebar.expander("Cache"):
+        st.caption(f"Budget: {config.CACHE_MAX_MB} MB")
+        st.dataframe(stats, use_container_width=True)
+
+def render_fiscal_year_filter(fiscal_years):
+    """Renders the fiscal year selector and returns the selected years (None = all).
+
+    Chosen before loading, so only the selected years' partitions are read.
+    """
+    if len(fiscal_years) <= 1:
+        return fiscal_years or None
+    options = fiscal_years + ["All Years"]
+    selected = st.sidebar.selectbox("Fiscal Year", options) # Newest year first
+    return None if selected == "All Years" else [selected]
+
+def render_fiscal_year_overview(summary):
+    """Displays the cross-year status and budget table."""
+    with st.expander("View All Fiscal Years"):
+        display_summary = summary.copy()
+        display_summary['Budget'] = display_summary['Budget'].map('${:,.2f}'.format)
+        st.dataframe(display_summary, use_container_width=True)
+
 def render_filters(df):
-    """Renders sidebar filters and returns the filtered dataframe and selected region."""
+    """Renders sidebar filters and returns the filtered dataframe, selected region and all selections."""
     st.sidebar.header("Filters")
     
     # Region Filter (New)
@@ -122,9 +164,8 @@ def render_filters(df):
     selected_status = st.sidebar.selectbox("Status", status_options)
     
     # Program Area Filter
-    # Strip whitespace to avoid duplicates and remove 'nan'
-    df['Program Area'] = df['Program Area'].astype(str).str.strip()
-    unique_areas = sorted([a for a in df['Program Area'].unique().tolist() if a.lower() != 'nan' and a != ''])
+    # Program Area is already stripped and non-blank (see schema.normalize_tasks)
+    unique_areas = sorted(df['Program Area'].unique().tolist())
     area_options = ["All"] + unique_areas
     selected_area = st.sidebar.selectbox("Program Area", area_options)
     
@@ -147,56 +188,126 @@ def render_filters(df):
         filtered_df = filtered_df[filtered_df['Activities'].astype(str).str.contains(search_query, case=False, na=False) | 
                                   filtered_df['ACMS Sub-Activities'].astype(str).str.contains(search_query, case=False, na=False)]
                                   
-    return filtered_df, selected_region
+    selection = {'Region': selected_region, 'Status': selected_status, 'Program Area': selected_area, 'Search': search_query}
+    return filtered_df, selected_region, selection
+
+def render_financial_summary(df, budget_df, budget_rollup=None):
+    """Displays financial summary statistics from the long budget table.
 
-def render_financial_summary(df):
-    """Displays financial summary statistics."""
+    `budget_rollup`, when given, holds the pre-aggregated budget sums for the
+    current selection and is used instead of the line items.
+    """
     st.subheader("💰 Financial Summary")
     
-    # Ensure numeric columns
-    q1_col = "Oct -Dec 2025"
-    q2_col = "Jan - Mar 2026"
-    
-    # Convert to numeric, coercing errors to NaN then 0
-    df[q1_col] = pd.to_numeric(df[q1_col], errors='coerce').fillna(0)
-    df[q2_col] = pd.to_numeric(df[q2_col], errors='coerce').fillna(0)
+    if budget_rollup is not None:
+        lines = budget_rollup
+    else:
+        # Budget lines for the tasks in the current selection, tagged with their Program Area
+        lines = budget_df[budget_df['ID'].isin(df['ID'])]
+        lines = lines.assign(**{'Program Area': lines['ID'].map(df.set_index('ID')['Program Area'])})
+    periods = sorted(lines['Period'].unique(), key=budgets.period_sort_key)
     
-    total_q1 = df[q1_col].sum()
-    total_q2 = df[q2_col].sum()
-    total_budget = total_q1 + total_q2
+    period_totals = lines.groupby('Period')['Amount'].sum()
+    total_budget = period_totals.sum()
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
+    cols = st.columns(len(periods) + 1)
+    with cols[0]:
         st.metric("Total Budget", f"${total_budget:,.2f}")
-    with col2:
-        st.metric("Q1 Budget", f"${total_q1:,.2f}")
-    with col3:
-        st.metric("Q2 Budget", f"${total_q2:,.2f}")
+    for col, period in zip(cols[1:], periods):
+        with col:
+            st.metric(f"{budgets.period_label(period)} Budget", f"${period_totals[period]:,.2f}")
         
     # Per Program Area Summary
     st.markdown("#### Budget by Program Area")
-    area_summary = df.groupby('Program Area')[[q1_col, q2_col]].sum()
-    area_summary['Total'] = area_summary[q1_col] + area_summary[q2_col]
+    area_summary = lines.pivot_table(index='Program Area', columns='Period', values='Amount', aggfunc='sum', fill_value=0)
+    area_summary = area_summary.reindex(columns=periods)
+    area_summary.columns.name = None
+    area_summary['Total'] = area_summary.sum(axis=1)
     area_summary = area_summary.sort_values('Total', ascending=False)
     
     # Format for display
-    display_summary = area_summary.copy()
-    display_summary[q1_col] = display_summary[q1_col].map('${:,.2f}'.format)
-    display_summary[q2_col] = display_summary[q2_col].map('${:,.2f}'.format)
-    display_summary['Total'] = display_summary['Total'].map('${:,.2f}'.format)
+    display_summary = area_summary.map('${:,.2f}'.format)
     
     st.dataframe(display_summary, use_container_width=True)
 
 
-def render_data_editor(df):
-    """Renders the editable dataframe."""
+def render_hierarchy(df, index):
+    """Drill-down through the workplan structure, using the index's precomputed subtree totals."""
+    if index is None or index.empty:
+        return
+    with st.expander("🗂️ Workplan Structure"):
+        node = -1
+        while True:
+            kids = hierarchy.children(index, node)
+            if kids.empty:
+                break
+            st.dataframe(
+                kids[['Kind', 'Label', 'Tasks', 'Completed', 'Progress (%)', 'Budget']],
+                column_config={"Budget": st.column_config.NumberColumn(format="$%.2f")},
+                hide_index=True,
+                use_container_width=True
+            )
+            choice = st.selectbox(
+                f"Open {kids['Kind'].iloc[0]}" if kids['Kind'].nunique() == 1 else "Open",
+                [None] + kids.index.tolist(),
+                format_func=lambda n: "Select..." if n is None else str(index.at[n, 'Label'])[:80],
+                key=f"hierarchy_{node}"
+            )
+            if choice is None:
+                break
+            node = choice
+        
+        if node != -1:
+            st.caption(" › ".join(str(label)[:40] for label in hierarchy.path(index, node)['Label']))
+            tasks = hierarchy.rows(df, index, node)
+            st.dataframe(tasks[[c for c in ['ID', 'Region', 'Status', 'Progress (%)', 'ACMS Sub-Activities'] if c in tasks.columns]],
+                         hide_index=True, use_container_width=True)
+
+def render_burndown(first_day, load_trend):
+    """Burn-down of open tasks over a date range, read (via `load_trend(start, end, by)`) from the progress history."""
+    with st.expander("📉 Progress Over Time"):
+        if first_day is None:
+            st.caption("No progress history recorded yet.")
+            return
+        today = date.today()
+        first = min(date.fromisoformat(first_day), today)
+        col1, col2 = st.columns(2)
+        with col1:
+            dates = st.date_input("Date Range", (max(first, today - timedelta(days=90)), today),
+                                  min_value=first, max_value=today, key="burndown_dates")
+        with col2:
+            by = st.selectbox("Break Down By", ["None", "Region", "Program Area"], key="burndown_by")
+        if len(dates) != 2:
+            return # Still picking the end date
+        
+        trend = load_trend(dates[0], dates[1], None if by == "None" else by)
+        if trend.empty:
+            st.caption("No progress history in this range.")
+            return
+        if by == "None":
+            st.line_chart(trend.set_index('Day')[['Remaining', 'Completed']])
+        else:
+            st.line_chart(trend.pivot(index='Day', columns=by, values='Remaining'))
+        st.caption(f"Open (not Completed) tasks per day. History starts on {first_day}.")
+
+def render_data_editor(df, budget_view, comment_counts=None, key="data_editor"):
+    """Renders the editable dataframe, with budgets joined from the wide budget view.
+    
+    Comments shows each task's latest comment; `comment_counts` (per ID) adds
+    the size of its thread.
+    """
     st.subheader(f"Tasks ({len(df)})")
     
+    df = df.join(budget_view, on='ID')
+    if comment_counts is not None:
+        df['Comment Count'] = df['ID'].map(comment_counts).fillna(0).astype(int)
+    periods = list(budget_view.columns)
+    
     column_config = {
         "ID": st.column_config.NumberColumn("ID", disabled=True, width="small"),
         "Status": st.column_config.SelectboxColumn(
             "Status",
-            options=["Pending", "In Progress", "Completed", "Delayed"],
+            options=config.STATUS_OPTIONS,
             required=True,
             width="medium"
         ),
@@ -208,12 +319,13 @@ def render_data_editor(df):
         ),
         "Activities": st.column_config.TextColumn("Activity", width="large", disabled=True),
         "ACMS Sub-Activities": st.column_config.TextColumn("Sub-Activity", width="large", disabled=True),
-        "Comments": st.column_config.TextColumn("Comments", width="large"),
-        "Oct -Dec 2025": st.column_config.NumberColumn("Q1 Budget", width="small", format="$%.2f"),
-        "Jan - Mar 2026": st.column_config.NumberColumn("Q2 Budget", width="small", format="$%.2f"),
+        "Comments": st.column_config.TextColumn("Latest Comment", width="large"),
+        "Comment Count": st.column_config.NumberColumn("💬", disabled=True, width="small"),
     }
+    for period in periods:
+        column_config[period] = st.column_config.NumberColumn(f"{budgets.period_label(period)} Budget", width="small", format="$%.2f")
     
-    display_cols = ['ID', 'Status', 'Progress (%)', 'Comments', 'Program Area', 'Activities', 'ACMS Sub-Activities', 'Oct -Dec 2025', 'Jan - Mar 2026']
+    display_cols = ['ID', 'Status', 'Progress (%)', 'Comments', 'Comment Count', 'Program Area', 'Activities', 'ACMS Sub-Activities'] + periods
     
     # Ensure columns exist before selecting
     available_cols = [c for c in display_cols if c in df.columns]
@@ -224,7 +336,61 @@ def render_data_editor(df):
         use_container_width=True,
         hide_index=True,
         num_rows="fixed",
-        key="data_editor"
+        key=key
     )
     
     return edited_df
+
+def render_report_export(df, budget_view, version, scope=None, tracker=None):
+    """Sidebar control that builds the per-region / per-Program-Area reports in the background."""
+    st.sidebar.header("Reports")
+    if version is None:
+        return
+    
+    wide_df = df.join(budget_view, on='ID')
+    job_key = f"report_job_{tracker}"
+    if st.sidebar.button("Export Reports"):
+        st.session_state[job_key] = reports.start_export(wide_df, version, scope, tracker=tracker)
+    
+    job = st.session_state.get(job_key)
+    if job is None:
+        return
+    if not job.done():
+        st.sidebar.info("Building reports in the background...")
+        return
+    if job.exception() is not None:
+        st.sidebar.error(f"Report export failed: {job.exception()}")
+        return
+    
+    with st.sidebar.expander("Download Reports"):
+        for (column, value), path in job.result().items():
+            if not os.path.exists(path):
+                continue # Superseded by a newer data version
+            with open(path, 'rb') as f:
+                st.download_button(f"{column}: {value}", f.read(), file_name=os.path.basename(path), key=path)
+
+def render_comment_thread(df, load_thread):
+    """Shows the full comment thread of one task, read (via `load_thread(task_id)`) only once a task is picked.
+    
+    Returns (task ID, comment) when a new comment is posted, else None.
+    """
+    with st.expander("💬 Comment Threads"):
+        activities = df.set_index('ID')['Activities'].astype(str)
+        task_id = st.selectbox(
+            "Task",
+            [None] + df['ID'].tolist(),
+            format_func=lambda i: "Select a task..." if i is None else f"{i} - {activities[i][:60]}"
+        )
+        if task_id is None:
+            return None
+        
+        thread = load_thread(task_id)
+        if thread.empty:
+            st.caption("No comments yet.")
+        for _, comment in thread.iterrows():
+            st.markdown(f"**{comment['Author']}** · {comment['Date']}  \n{comment['Comment']}")
+        
+        text = st.text_area("Add a comment", key=f"comment_{task_id}")
+        if st.button("Post Comment") and text.strip():
+            return task_id, text.strip()
+    return None
@@ -0,0 +1,64 @@
+import argparse
+import os
+import re
+from datetime import datetime
+import pandas as pd
+from modules.data_manager import DataManager
+from modules.history import ProgressHistory
+from modules import config, schema
+
+# Records each tracker's per-task Status and Progress for today. Saves from the
+# app, API and CLI already do this; run it daily (cron / Task Scheduler) so edits
+# made directly in Excel are caught too.
+
+def record_today(trackers):
+    for name in trackers:
+        df = DataManager.load_data(copy=False, tracker=name)
+        if df is None:
+            print(f"Skipping {name}: tracker file not found")
+            continue
+        written = DataManager.record_history(df, name)
+        print(f"{name}: {written} task(s) changed since the last snapshot")
+
+def backfill(trackers):
+    # Seed the days before the history starts from the backups, oldest first
+    for name in trackers:
+        path, sheet = config.TRACKERS[name]
+        first_day = ProgressHistory.first_day(tracker=path)
+        prefix = DataManager._backup_prefix(path)
+        files = sorted(f for f in os.listdir(config.BACKUP_DIR) if f.startswith(prefix) and f.endswith('.xlsx'))
+        for f in files:
+            stamp = re.search(r'(\d{8})_\d{6}\.xlsx$', f)
+            if not stamp:
+                continue
+            day = datetime.strptime(stamp.group(1), "%Y%m%d").date().isoformat()
+            if first_day and day >= first_day:
+                continue # Recorded saves are more precise than the backup taken before them
+            try:
+                with pd.ExcelFile(os.path.join(config.BACKUP_DIR, f)) as xls:
+                    df = schema.read_tasks(xls, sheet)
+            except Exception as e:
+                print(f"Skipping {f}: {e}")
+                continue
+            if 'Region' not in df.columns or 'Status' not in df.columns:
+                print(f"Skipping {f}: written before the regional structure")
+                continue
+            written = ProgressHistory.record(df, day, tracker=path)
+            print(f"{name} {day}: {written} task(s) from {f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record daily progress snapshots of the CHASAC workplan trackers")
+    parser.add_argument('--tracker', choices=list(config.TRACKERS), help="Only this tracker (default: all)")
+    parser.add_argument('--backfill', action='store_true', help=f"Also seed older history from the backups in {config.BACKUP_DIR}/")
+    args = parser.parse_args()
+
+    trackers = [args.tracker] if args.tracker else DataManager.trackers()
+    if not trackers:
+        print(f"Error: Tracker file not found at {config.TRACKER_FILE}")
+        return
+    if args.backfill:
+        backfill(trackers)
+    record_today(trackers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import pandas as pd
+import pytest
+from modules import config, schema
+from modules.cache import FrameCache
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A scratch working directory: the app keeps its tracker, caches and databases at relative paths."""
+    monkeypatch.chdir(tmp_path)
+    for directory in (config.BACKUP_DIR, config.SNAPSHOT_DIR, config.REPORT_DIR):
+        os.makedirs(directory)
+    FrameCache.clear()
+    yield tmp_path
+    FrameCache.clear()
+
+@pytest.fixture
+def tracker(workdir):
+    """A small regional tracker (two tasks in North, one in Adamawa)."""
+    schema.write_workbook(config.TRACKER_FILE, config.SHEET_NAME, pd.DataFrame({
+        'ID': [1, 2, 3],
+        'Region': ['North', 'North', 'Adamawa'],
+        'Fiscal Year': ['FY26', 'FY26', 'FY26'],
+        'Activities': ['Activities 1.1.1 Testing', 'Activities 1.1.2 Linkage', 'Activities 1.1.1 Testing'],
+        'Program Area': ['HTS', 'PMTCT', 'HTS'],
+        'Oct -Dec 2025': [100.0, 200.0, 300.0],
+        'Status': ['Pending', 'Pending', 'Pending'],
+        'Progress (%)': [0, 0, 0],
+        'Comments': ['', '', ''],
+    }))
+    return config.DEFAULT_TRACKER
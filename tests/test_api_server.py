@@ -0,0 +1,16 @@
+import pytest
+import api_server
+from modules.data_manager import DataManager
+
+def test_fractional_progress_is_rejected(tracker):
+    with pytest.raises(api_server.ApiError) as error:
+        api_server.patch_tasks([{'ID': 1, 'Progress (%)': 45.5}], 'me@example.org')
+    assert error.value.status == 422
+
+def test_whole_progress_is_saved(tracker):
+    body = api_server.patch_tasks([{'ID': 1, 'Progress (%)': 45.0, 'Status': 'In Progress'}], 'me@example.org')
+
+    assert body == {'changed': [1]}
+    saved = DataManager.load_data().set_index('ID')
+    assert saved.at[1, 'Progress (%)'] == 45
+    assert saved.at[1, 'Status'] == 'In Progress'
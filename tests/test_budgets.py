@@ -0,0 +1,15 @@
+import pandas as pd
+from modules import budgets
+
+def test_row_fiscal_years_follow_each_rows_budget():
+    df = pd.DataFrame({
+        'ID': [1, 2, 3],
+        'Oct -Dec 2025': [1200.0, 0, ''],
+        'Oct -Dec 2026': [0, 800.0, ''],
+    })
+    # Row 3 has no budget and takes the workplan's first year
+    assert budgets.row_fiscal_years(df).tolist() == ['FY26', 'FY27', 'FY26']
+
+def test_row_fiscal_years_without_periods_use_the_default():
+    df = pd.DataFrame({'ID': [1, 2]})
+    assert budgets.row_fiscal_years(df, 'FY26').tolist() == ['FY26', 'FY26']
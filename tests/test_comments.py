@@ -0,0 +1,14 @@
+import pandas as pd
+from modules.comments import CommentStore
+
+def test_cells_are_imported_once_per_tracker(workdir):
+    df = pd.DataFrame({'ID': [1, 2], 'Comments': ['Started | Halfway', '']})
+
+    assert CommentStore.import_cells(df, tracker='tracker.xlsx') == [1]
+    assert CommentStore.thread(1, tracker='tracker.xlsx')['Comment'].tolist() == ['Started', 'Halfway']
+    assert df.at[0, 'Comments'] == 'Halfway'
+
+    # A save's new cell, read before the save appends it to the thread, isn't imported again
+    df.at[1, 'Comments'] = 'Done'
+    assert CommentStore.import_cells(df, tracker='tracker.xlsx') == []
+    assert CommentStore.thread(2, tracker='tracker.xlsx').empty
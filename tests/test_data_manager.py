@@ -0,0 +1,50 @@
+from modules.cache import FrameCache
+from modules.data_manager import DataManager
+
+def _view_entries(name):
+    return [key for key in FrameCache._entries if key[1][0] == name]
+
+def test_derived_views_live_in_the_frame_cache(tracker):
+    view = DataManager.load_budget_view(tracker=tracker)
+    index = DataManager.load_hierarchy(tracker=tracker)
+    assert DataManager.load_budget_view(tracker=tracker) is view # Served from the cache
+    assert len(_view_entries('budget_view')) == len(_view_entries('hierarchy')) == 1
+    assert all(FrameCache._entries[key]['bytes'] > 0 for key in _view_entries('hierarchy')) # Counted in the budget
+
+    # A new workbook version replaces the entries instead of adding more
+    df = DataManager.load_data(tracker=tracker)
+    df.loc[df['ID'] == 1, 'Status'] = 'Completed'
+    assert DataManager.save_data(df, changed_ids=[1], tracker=tracker)
+    assert DataManager.load_hierarchy(tracker=tracker) is not index
+    assert DataManager.load_hierarchy(tracker=tracker).loc[0, 'Completed'] == 1
+    assert len(_view_entries('hierarchy')) == 1
+
+def test_later_fiscal_year_is_merged_into_the_tracker(tracker):
+    import pandas as pd
+    from modules import budgets
+    df = DataManager.load_data(tracker=tracker)
+    df.loc[df['ID'] == 1, 'Status'] = 'Completed'
+    assert DataManager.save_data(df, changed_ids=[1], tracker=tracker)
+
+    # Extractor output for the next workplan: no regions yet, IDs from 1 again
+    extracted = pd.DataFrame({
+        'ID': [1, 2],
+        'Activities': ['Activities 1.1.1 Testing', 'Activities 1.2.1 Recency'],
+        'Program Area': ['HTS', 'HTS'],
+        'Oct -Dec 2026': [300.0, 0.0],
+        'Jan - Mar 2027': [0.0, 600.0],
+        'Status': ['Pending', 'Pending'],
+        'Progress (%)': [0, 0],
+        'Comments': ['', ''],
+    })
+    extracted.insert(1, 'Fiscal Year', budgets.row_fiscal_years(extracted))
+
+    assert DataManager.add_fiscal_years(extracted, tracker) == ['FY27']
+    merged = DataManager.load_data(tracker=tracker).set_index('ID')
+    assert merged.at[1, 'Status'] == 'Completed' # Existing statuses are kept
+    new = merged[merged['Fiscal Year'] == 'FY27']
+    assert len(new) == 6 and new.index.min() == 4 # Two tasks x three regions, numbered after the FY26 ones
+    assert DataManager.load_budgets(['FY27'], tracker=tracker)['Amount'].sum() == 900.0
+
+    assert DataManager.add_fiscal_years(extracted, tracker) == [] # Already there
+    assert len(DataManager.load_data(tracker=tracker)) == 9
@@ -0,0 +1,61 @@
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from modules import excel_writer
+
+SHEET = 'Tracker'
+HEADER = ['ID', 'Activities', 'Status', 'Progress (%)', 'Comments']
+
+def _tracker(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SHEET
+    ws.append(HEADER)
+    for task_id in (1, 2, 3):
+        ws.append([task_id, f"Activity {task_id}", 'Pending', 0, ''])
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill('solid', fgColor='FFCC00')
+    for row in ws.iter_rows(min_row=2):
+        for cell in row:
+            cell.alignment = Alignment(wrap_text=True)
+    ws.column_dimensions['B'].width = 42
+    wb.save(path)
+
+def _styles(path):
+    ws = load_workbook(path)[SHEET]
+    return ([(c.font.b, c.fill.fgColor.rgb) for c in ws[1]],
+            [[c.alignment.wrap_text for c in row] for row in ws.iter_rows(min_row=2)],
+            ws.column_dimensions['B'].width)
+
+def test_patch_round_trips_through_read_excel(tmp_path):
+    path = str(tmp_path / 'tracker.xlsx')
+    _tracker(path)
+    styles = _styles(path)
+    rows = pd.DataFrame({'Status': ['Completed'], 'Progress (%)': [100], 'Comments': ['Done & dusted <ok>']},
+                        index=pd.Index([2], name='ID'))
+
+    assert excel_writer.patch_workbook(path, SHEET, rows)
+
+    df = pd.read_excel(path, sheet_name=SHEET).set_index('ID')
+    assert list(df.columns) == HEADER[1:]
+    assert df.loc[2, ['Status', 'Progress (%)', 'Comments']].tolist() == ['Completed', 100, 'Done & dusted <ok>']
+    assert df.loc[[1, 3], 'Status'].tolist() == ['Pending', 'Pending']
+    assert _styles(path) == styles
+
+def test_patch_strips_control_characters(tmp_path):
+    path = str(tmp_path / 'tracker.xlsx')
+    _tracker(path)
+    rows = pd.DataFrame({'Comments': ['line one\x0bline two']}, index=pd.Index([1], name='ID'))
+
+    assert excel_writer.patch_workbook(path, SHEET, rows)
+    assert pd.read_excel(path, sheet_name=SHEET).at[0, 'Comments'] == 'line oneline two'
+
+def test_unknown_id_leaves_the_file_alone(tmp_path):
+    path = str(tmp_path / 'tracker.xlsx')
+    _tracker(path)
+    before = open(path, 'rb').read()
+    rows = pd.DataFrame({'Status': ['Completed']}, index=pd.Index([99], name='ID'))
+
+    assert not excel_writer.patch_workbook(path, SHEET, rows)
+    assert open(path, 'rb').read() == before
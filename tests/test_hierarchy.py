@@ -0,0 +1,33 @@
+import pandas as pd
+from modules import hierarchy
+
+def _tracker(rows):
+    """Task frame from (Activities, Code Sub -activities, ACMS Sub-Activities, Status) rows."""
+    df = pd.DataFrame(rows, columns=['Activities', 'Code Sub -activities', 'ACMS Sub-Activities', 'Status'])
+    return df.assign(ID=range(1, len(df) + 1), **{'Progress (%)': 0})
+
+def test_first_strategy_without_header_rows_is_derived_from_activity_codes():
+    df = _tracker([
+        # Strategy 1 / Objective 1.1 header rows were dropped
+        ('Activities 1.1.1 Roll out testing', '1.1.1.1', 'Sub-Activities 1.1.1.1 Mentor sites', 'Completed'),
+        ('', '1.1.1.2', 'Sub-Activities 1.1.1.2 Print SOPs', 'Pending'),
+        ('Activities 1.2.1 Targeted testing', '1.2.1.1', 'Sub-Activities 1.2.1.1 Index testing', 'Pending'),
+        ('Strategy 2: Care and treatment', '1.2.1.1', '', 'Pending'),
+        ('Objective 2.1: Linkage', '1.2.1.1', '', 'Pending'),
+        ('Activities 2.2.1 Active linkage', '2.2.1.1', 'Sub-Activities 2.2.1.1 Escort clients', 'Pending'),
+    ])
+    index = hierarchy.build(df)
+
+    top = hierarchy.children(index)
+    assert top['Label'].tolist() == ['Strategy 1', 'Strategy 2: Care and treatment']
+    assert top['Tasks'].sum() == len(df)
+    strategy_1 = top.index[0]
+    objectives = hierarchy.children(index, strategy_1)
+    assert objectives['Label'].tolist() == ['Objective 1.1', 'Objective 1.2']
+    assert objectives['Tasks'].tolist() == [2, 1]
+    assert index.at[strategy_1, 'Completed'] == 1
+
+    # Real headers are kept as they are, even when the activity codes disagree with them
+    objective_2 = hierarchy.children(index, top.index[1])
+    assert objective_2['Label'].tolist() == ['Objective 2.1: Linkage']
+    assert hierarchy.children(index, objective_2.index[0])['Label'].tolist() == ['Activities 2.2.1 Active linkage']
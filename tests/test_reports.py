@@ -0,0 +1,28 @@
+import os
+import pandas as pd
+from modules import reports
+
+def _tasks():
+    return pd.DataFrame({
+        'ID': [1, 2, 3],
+        'Region': ['North', 'North', 'Adamawa'],
+        'Program Area': ['HTS', 'PMTCT', 'PMTCT'],
+        'Status': ['Pending', 'Pending', 'Pending'],
+        'Oct -Dec 2025': [100.0, 200.0, 300.0],
+    })
+
+def test_edit_rebuilds_only_the_reports_of_its_groups(workdir):
+    df = _tasks()
+    before = reports.export(df, workers=1)
+    stamps = {key: os.stat(path).st_mtime_ns for key, path in before.items()}
+
+    df.loc[df['ID'] == 1, 'Status'] = 'Completed' # North / HTS
+    after = reports.export(df, workers=1)
+
+    rebuilt = {key for key in after if after[key] != before[key]}
+    assert rebuilt == {('Region', 'North'), ('Program Area', 'HTS')}
+    for key in after.keys() - rebuilt:
+        assert os.stat(after[key]).st_mtime_ns == stamps[key] # Not regenerated
+    assert sorted(os.listdir(reports.report_dir())) == sorted(os.path.basename(p) for p in after.values())
+    north = pd.read_excel(after[('Region', 'North')])
+    assert north.set_index('ID').at[1, 'Status'] == 'Completed'
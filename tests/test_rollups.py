@@ -0,0 +1,54 @@
+import pandas as pd
+from modules import rollups
+
+def _tables():
+    df = pd.DataFrame({
+        'ID': [1, 2, 3, 4],
+        'Fiscal Year': ['FY26'] * 4,
+        'Region': ['North', 'North', 'Adamawa', 'Adamawa'],
+        'Program Area': ['HTS', 'HTS', 'HTS', 'PMTCT'],
+        'Status': ['Pending', 'In Progress', 'Pending', 'Completed'],
+    })
+    budget_df = pd.DataFrame({
+        'ID': [1, 2, 3, 4],
+        'Period': ['Oct -Dec 2025'] * 4,
+        'Amount': [100.0, 250.0, 0.0, 75.5],
+    })
+    return df, budget_df
+
+def test_status_change_delta_matches_full_recompute():
+    df, budget_df = _tables()
+    status_rollup, budget_rollup = rollups.compute(df, budget_df)
+
+    after = df.copy()
+    after.loc[after['ID'].isin([1, 4]), 'Status'] = ['Completed', 'Delayed']
+    changed = df['ID'].isin([1, 4])
+    status_rollup = rollups.apply_delta(status_rollup, df[changed], after[changed])
+
+    assert rollups.verify((status_rollup, budget_rollup), after, budget_df)
+    counts = status_rollup.set_index(['Region', 'Program Area', 'Status'])['Count']
+    assert counts[('North', 'HTS', 'Completed')] == 1
+    assert ('North', 'HTS', 'Pending') not in counts.index # Emptied groups are dropped
+
+def test_verify_catches_a_stale_rollup():
+    df, budget_df = _tables()
+    stale = rollups.compute(df, budget_df)
+    after = df.assign(Status='Completed')
+    assert not rollups.verify(stale, after, budget_df)
+
+def test_saved_edit_keeps_stored_rollups_consistent(tracker, monkeypatch):
+    from modules.data_manager import DataManager
+    deltas = []
+    def apply_delta(rollup, before, after):
+        deltas.append(before['ID'].tolist())
+        return original(rollup, before, after)
+    original = rollups.apply_delta
+    monkeypatch.setattr(rollups, 'apply_delta', apply_delta)
+
+    DataManager.load_rollups(tracker=tracker) # Builds the store and its rollups
+    df = DataManager.load_data(tracker=tracker)
+    df.loc[df['ID'] == 2, 'Status'] = 'Delayed'
+
+    assert DataManager.save_data(df, changed_ids=[2], tracker=tracker)
+    assert deltas == [[2]] # Only the changed row was read back from the store
+    assert DataManager.verify_rollups(tracker=tracker)
@@ -0,0 +1,20 @@
+import pandas as pd
+from openpyxl import load_workbook
+from modules import schema
+
+def test_full_rewrite_keeps_header_fill_and_column_widths(tmp_path):
+    path = str(tmp_path / 'tracker.xlsx')
+    df = pd.DataFrame({
+        'ID': [1, 2],
+        'Activities': ['Activities 1.1.1 ' + 'x' * 80, 'Activities 1.1.2 Short'],
+        'Program Area': ['HTS', 'PMTCT'],
+        'Status': ['Pending', 'Completed'],
+    })
+
+    schema.write_workbook(path, 'SI_Tasks', df)
+
+    ws = load_workbook(path)['SI_Tasks']
+    assert {cell.fill.fgColor.rgb for cell in ws[1]} == {'001F4E78'}
+    assert all(cell.font.b for cell in ws[1])
+    assert ws.column_dimensions['B'].width == 50 # Capped
+    assert ws.column_dimensions['C'].width == len('Program Area') + 2
@@ -1,7 +1,12 @@
-import pandas as pd
 import os
 import sys
+import getpass
+import concurrent.futures
+import logging
 from openpyxl import load_workbook
+from modules import budgets, reports, hierarchy
+from modules.data_manager import DataManager
+from modules.snapshot import Snapshot
 
 TRACKER_FILE = "Full_Workplan_Tracker.xlsx"
 SHEET_NAME = "All_Tasks"
@@ -10,20 +15,24 @@ def load_data():
     if not os.path.exists(TRACKER_FILE):
         print(f"Error: Tracker file not found at {TRACKER_FILE}")
         return None
-    return pd.read_excel(TRACKER_FILE, sheet_name=SHEET_NAME)
+    # Same loading as the app (migration, comment import); budget periods as columns for display
+    df = DataManager.load_data()
+    if df is None:
+        print(f"Error: Could not load {TRACKER_FILE}")
+        return None
+    return df.join(DataManager.load_budget_view(), on='ID')
 
-def save_data(df):
-    try:
-        # We use openpyxl to save to preserve formatting if possible, 
-        # but pandas to_excel overwrites. 
-        # For simplicity in this CLI, we'll overwrite and re-apply basic formatting logic 
-        # or just use pandas for data updates.
-        # To avoid losing formatting, we can use openpyxl directly for updates, 
-        # but pandas is easier for querying.
-        # Let's just overwrite for now, the extraction script handles initial formatting.
-        df.to_excel(TRACKER_FILE, index=False, sheet_name=SHEET_NAME)
+def save_data(df, changed_ids):
+    # Saved like the app's edits: under the write lock, on top of the latest rows (others
+    # may have saved since this session loaded), with backup, change feed and history
+    latest = DataManager.load_data()
+    edited = df[df['ID'].isin(changed_ids)][['ID', 'Status', 'Progress (%)', 'Comments']]
+    changed_ids, comments = DataManager.apply_changes(latest, edited, getpass.getuser())
+    if not changed_ids:
+        print("No changes to save.")
+    elif DataManager.save_data(latest, changed_ids=changed_ids, comments=comments):
         print("Changes saved successfully.")
-    except PermissionError:
+    else:
         print("Error: Could not save file. Please close Excel if it is open.")
 
 def show_summary(df):
@@ -51,7 +60,7 @@ def list_tasks(df, filter_status=None):
     print(f"\nListing {len(tasks)} tasks:")
     print("-" * 100)
     # Adjust columns for display
-    display_cols = ['ID', 'Status', 'Activities', 'Oct -Dec 2025', 'Jan - Mar 2026']
+    display_cols = ['ID', 'Status', 'Activities'] + budgets.period_columns(tasks)
     
     # Truncate long text
     display_df = tasks[display_cols].copy()
@@ -85,17 +94,15 @@ def update_task(df):
             elif status_map[choice] == 'Pending':
                 df.loc[df['ID'] == task_id, 'Progress (%)'] = 0
             
+            # Comments go to the task's thread; the sheet keeps only the latest one
+            thread = DataManager.comment_thread(task_id)
+            for _, c in thread.tail(5).iterrows():
+                print(f"  [{c['Date']}] {c['Author']}: {c['Comment']}")
             comment = input("Add a comment (optional): ")
             if comment:
-                current_comment = str(df.loc[df['ID'] == task_id, 'Comments'].values[0])
-                if current_comment == 'nan': current_comment = ""
-                if current_comment:
-                    new_comment = current_comment + " | " + comment
-                else:
-                    new_comment = comment
-                df.loc[df['ID'] == task_id, 'Comments'] = new_comment
+                df.loc[df['ID'] == task_id, 'Comments'] = comment # Appended to the thread on save
                 
-            save_data(df)
+            save_data(df, changed_ids=[task_id])
         else:
             print("Invalid choice.")
             
@@ -104,8 +111,48 @@ def update_task(df):
     
     return df
 
+def export_reports(df):
+    # Runs in the background; choosing the option again shows the result
+    job = reports.start_export(df, Snapshot.file_hash(TRACKER_FILE))
+    try:
+        paths = job.result(timeout=1) # Cached reports come back at once
+    except concurrent.futures.TimeoutError:
+        print("Building reports in the background. Choose this option again to see them.")
+        return
+    except Exception as e:
+        print(f"Error: Report export failed: {e}")
+        return
+    print(f"\n{len(paths)} reports in {reports.report_dir()}:")
+    for (column, value), path in paths.items():
+        print(f"  {column}: {value} -> {os.path.basename(path)}")
+
+def browse_structure(df):
+    # Built on each visit; totals are range sums, so drilling down costs nothing extra
+    index = hierarchy.build(df)
+    node = -1
+    while True:
+        kids = hierarchy.children(index, node)
+        if node != -1:
+            print("\n" + " > ".join(str(label)[:40] for label in hierarchy.path(index, node)['Label']))
+        if kids.empty:
+            list_tasks(hierarchy.rows(df, index, node))
+        else:
+            print("-" * 100)
+            for i, (_, n) in enumerate(kids.iterrows(), 1):
+                label = str(n['Label'])[:50]
+                print(f"{i:>3}. [{n['Kind']}] {label:<50} {n['Tasks']:>4} tasks  {n['Completed']:>4} done  {n['Progress (%)']:>5.1f}%  ${n['Budget']:,.2f}")
+            print("-" * 100)
+        choice = input("Enter a number to open, 'b' to go back, or Enter to return to the menu: ").strip().lower()
+        if choice == 'b':
+            node = -1 if node == -1 else index.at[node, 'Parent']
+        elif choice.isdigit() and 1 <= int(choice) <= len(kids):
+            node = kids.index[int(choice) - 1]
+        else:
+            return
+
 def main():
     print("Welcome to the SI Manager Workplan Tracker")
+    logging.disable(logging.WARNING) # DataManager's bare-mode Streamlit warnings would clutter the menu
     df = load_data()
     if df is None:
         return
@@ -116,7 +163,9 @@ def main():
         print("2. List All Tasks")
         print("3. List Pending Tasks")
         print("4. Update Task Status")
-        print("5. Exit")
+        print("5. Export Reports")
+        print("6. Browse Workplan Structure")
+        print("7. Exit")
         
         choice = input("Enter choice: ")
         
@@ -129,6 +178,14 @@ def main():
         elif choice == '4':
             df = update_task(df)
         elif choice == '5':
+            export_reports(df)
+        elif choice == '6':
+            browse_structure(df)
+        elif choice == '7':
+            # The worker pool can't outlive the interpreter, so let a running export finish
+            for job in reports.running():
+                print("Waiting for the report export to finish...")
+                job.exception()
             print("Goodbye!")
             break
         else: